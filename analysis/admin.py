@@ -1,3 +1,15 @@
 from django.contrib import admin
 
-# Register your models here.
+from analysis.models import AnalysisJob
+
+
+@admin.register(AnalysisJob)
+class AnalysisJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'car_number', 'municipality', 'state', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    search_fields = ('id', 'car_number')
+    readonly_fields = (
+        'id', 'status', 'car_number', 'result', 'municipality', 'state', 'error',
+        'attempts', 'worker', 'created_at', 'started_at', 'finished_at', 'created_by', 'api_client',
+    )
+    exclude = ('geometry',)
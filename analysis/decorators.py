@@ -0,0 +1,59 @@
+import hashlib
+import hmac
+from functools import wraps
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.views.decorators.csrf import csrf_exempt
+
+
+def api_auth_required(view):
+    """
+    Autenticação das rotas de API (api/analyses/, api/batch/, api/jobs/).
+
+    - `Authorization: Bearer <token>` com um dos tokens de ANALYSIS_API_TOKENS:
+      clientes que não são navegadores, sem verificação de CSRF
+    - usuário logado (sessão): o token CSRF continua obrigatório, senão
+      qualquer site poderia enviar requisições em nome dele
+
+    Sem nenhum dos dois responde 401. `request.api_client` identifica o token
+    usado (resumo SHA-256) ou fica vazio para usuários logados.
+    """
+    csrf_check = CsrfViewMiddleware(lambda request: None)
+
+    @csrf_exempt
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        token = _valid_token(request)
+        request.api_client = hashlib.sha256(token.encode()).hexdigest() if token else ''
+
+        if token:
+            return view(request, *args, **kwargs)
+
+        if request.user.is_authenticated:
+            rejected = csrf_check.process_view(request, None, args, kwargs)
+            if rejected is not None:
+                return rejected
+            return view(request, *args, **kwargs)
+
+        response = JsonResponse({'erro': 'Autenticação necessária.'}, status=401)
+        response['WWW-Authenticate'] = 'Bearer'
+        return response
+
+    return wrapper
+
+
+def _valid_token(request):
+    """Token of the Authorization header when it is one of ANALYSIS_API_TOKENS, else None."""
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    token = token.strip()
+
+    if scheme.lower() != 'bearer' or not token:
+        return None
+
+    for valid in getattr(settings, 'ANALYSIS_API_TOKENS', []):
+        if valid and hmac.compare_digest(token.encode(), valid.encode()):
+            return valid
+
+    return None
@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from analysis.services.analyze_coordinates.overlap.car_overlap_service import CarOverlapService
+
+
+class Command(BaseCommand):
+    help = (
+        "(Re)constrói a tabela de sobreposições pré-calculadas entre os imóveis do SICAR e "
+        "as camadas ambientais. Os CARs são divididos em faixas de id processadas em paralelo. "
+        "Depois da primeira construção, os comandos de importação recalculam apenas os CARs afetados."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Faixas de CAR processadas em paralelo (uma conexão por worker)."
+        )
+        parser.add_argument(
+            "--partition-size",
+            type=int,
+            default=5000,
+            help="Quantidade de ids de CAR por faixa (cada faixa é confirmada separadamente)."
+        )
+
+    def handle(self, *args, **options):
+        service = CarOverlapService(
+            partition_size=options["partition_size"],
+            workers=options["workers"],
+        )
+        labels = ", ".join(layer._meta.label for layer in service.layers)
+
+        self.stdout.write(f"Calculando sobreposições de CAR × {labels}...")
+        start = time.perf_counter()
+
+        def progress(done, last_id, max_id):
+            self.stdout.write(
+                f"  {done} CARs processados (faixa até o id {last_id} de {max_id}, "
+                f"{done / (time.perf_counter() - start):.0f} CARs/s)"
+            )
+
+        cars = service.rebuild(progress=progress)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✔ Sobreposições pré-calculadas para {cars} CARs em {time.perf_counter() - start:.1f}s"
+        ))
@@ -0,0 +1,104 @@
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from analysis.services.jobs.analysis_job_service import AnalysisJobService
+
+
+class Command(BaseCommand):
+    help = (
+        "Executa os jobs de análise enfileirados (api/jobs/). Cada thread pega o "
+        "job mais antigo com SELECT ... FOR UPDATE SKIP LOCKED, então vários "
+        "workers podem rodar ao mesmo tempo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=getattr(settings, "ANALYSIS_WORKER_CONCURRENCY", 2),
+            help="Quantidade de análises executadas em paralelo por este processo."
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=getattr(settings, "ANALYSIS_WORKER_POLL_INTERVAL", 2.0),
+            help="Segundos de espera quando a fila está vazia."
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Processa os jobs pendentes e encerra quando a fila esvaziar."
+        )
+        parser.add_argument(
+            "--requeue-interval",
+            type=float,
+            default=getattr(settings, "ANALYSIS_WORKER_REQUEUE_INTERVAL", 60.0),
+            help="Segundos entre duas verificações de jobs travados (worker morto no meio da análise)."
+        )
+
+    def handle(self, *args, **options):
+        self.service = AnalysisJobService()
+        self.stop = threading.Event()
+        self.once = options["once"]
+        self.poll_interval = options["poll_interval"]
+
+        signal.signal(signal.SIGTERM, lambda *_: self.stop.set())
+        signal.signal(signal.SIGINT, lambda *_: self.stop.set())
+
+        self.requeue_stale()
+        requeue_interval = options["requeue_interval"]
+        next_requeue = time.monotonic() + requeue_interval
+
+        hostname = f"{socket.gethostname()}:{os.getpid()}"
+        self.stdout.write(f"Worker {hostname} iniciado com {options['concurrency']} thread(s).")
+
+        threads = [
+            threading.Thread(target=self.work, args=(f"{hostname}/{i}",), daemon=True)
+            for i in range(options["concurrency"])
+        ]
+        for thread in threads:
+            thread.start()
+
+        # join with a timeout so signals are handled by the main thread, which
+        # also puts back the jobs of workers that died while this one runs
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=0.5)
+
+            if time.monotonic() >= next_requeue and not self.stop.is_set():
+                self.requeue_stale()
+                next_requeue = time.monotonic() + requeue_interval
+
+        connection.close()
+        self.stdout.write("Worker encerrado.")
+
+    def requeue_stale(self):
+        close_old_connections()
+        requeued, failed = self.service.requeue_stale()
+        if requeued or failed:
+            self.stdout.write(f"Jobs travados: {requeued} reenfileirados, {failed} marcados com erro.")
+
+    def work(self, worker_name):
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                job = self.service.claim_next(worker_name)
+
+                if job is None:
+                    if self.once:
+                        return
+                    self.stop.wait(self.poll_interval)
+                    continue
+
+                self.stdout.write(f"[{worker_name}] Job {job.id} iniciado.")
+                job = self.service.run(job)
+                self.stdout.write(f"[{worker_name}] Job {job.id}: {job.get_status_display()}.")
+        finally:
+            connection.close()
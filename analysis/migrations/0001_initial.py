@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:09
+
+import django.contrib.gis.db.models.fields
+import django.core.serializers.json
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalysisJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('pending', 'Na fila'), ('running', 'Em processamento'), ('done', 'Concluída'), ('failed', 'Com erro')], db_column='situacao', default='pending', max_length=10, verbose_name='Situação')),
+                ('geometry', django.contrib.gis.db.models.fields.GeometryField(blank=True, db_column='geometria', null=True, spatial_index=False, srid=4674, verbose_name='Geometria Analisada')),
+                ('car_number', models.CharField(blank=True, db_column='numero_car', max_length=43, null=True, verbose_name='Número do CAR')),
+                ('result', models.JSONField(blank=True, db_column='resultado', encoder=django.core.serializers.json.DjangoJSONEncoder, null=True, verbose_name='Resultado')),
+                ('municipality', models.CharField(blank=True, db_column='municipio', max_length=100, null=True, verbose_name='Município')),
+                ('state', models.CharField(blank=True, db_column='uf', max_length=2, null=True, verbose_name='UF')),
+                ('error', models.TextField(blank=True, db_column='erro', default='', verbose_name='Erro')),
+                ('attempts', models.PositiveSmallIntegerField(db_column='tentativas', default=0, verbose_name='Tentativas')),
+                ('worker', models.CharField(blank=True, db_column='worker', default='', max_length=100, verbose_name='Worker')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_column='criado_em', verbose_name='Criado em')),
+                ('started_at', models.DateTimeField(blank=True, db_column='iniciado_em', null=True, verbose_name='Iniciado em')),
+                ('finished_at', models.DateTimeField(blank=True, db_column='finalizado_em', null=True, verbose_name='Finalizado em')),
+                ('created_by', models.ForeignKey(blank=True, db_column='id_criado_por', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='analysis_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Criado por')),
+            ],
+            options={
+                'verbose_name': 'Job de Análise',
+                'verbose_name_plural': 'Jobs de Análise',
+                'db_table': 'tb_job_analise',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='idx_job_analise_fila')],
+            },
+        ),
+    ]
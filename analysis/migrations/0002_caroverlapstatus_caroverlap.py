@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0001_initial'),
+        ('car_system', '0009_sicarrecord_geometry_utm'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CarOverlapStatus',
+            fields=[
+                ('car', models.OneToOneField(db_column='id_car', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='overlap_status', serialize=False, to='car_system.sicarrecord', verbose_name='Imóvel (CAR)')),
+                ('computed_at', models.DateTimeField(db_column='calculado_em', verbose_name='Calculado em')),
+            ],
+            options={
+                'verbose_name': 'Situação das Sobreposições de CAR',
+                'verbose_name_plural': 'Situações das Sobreposições de CAR',
+                'db_table': 'tb_sobreposicao_car_situacao',
+            },
+        ),
+        migrations.CreateModel(
+            name='CarOverlap',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('layer', models.CharField(db_column='camada', max_length=100, verbose_name='Camada')),
+                ('feature_id', models.BigIntegerField(db_column='id_feicao', verbose_name='Feição')),
+                ('intersection_area_m2', models.FloatField(db_column='area_intersecao_m2', verbose_name='Área de Interseção (m²)')),
+                ('car', models.ForeignKey(db_column='id_car', on_delete=django.db.models.deletion.CASCADE, related_name='overlaps', to='car_system.sicarrecord', verbose_name='Imóvel (CAR)')),
+            ],
+            options={
+                'verbose_name': 'Sobreposição de CAR',
+                'verbose_name_plural': 'Sobreposições de CAR',
+                'db_table': 'tb_sobreposicao_car',
+                'indexes': [models.Index(fields=['layer', 'feature_id'], name='idx_sobreposicao_car_feicao')],
+                'constraints': [models.UniqueConstraint(fields=('car', 'layer', 'feature_id'), name='uq_sobreposicao_car')],
+            },
+        ),
+    ]
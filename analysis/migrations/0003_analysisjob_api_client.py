@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0002_caroverlapstatus_caroverlap'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysisjob',
+            name='api_client',
+            field=models.CharField(blank=True, db_column='cliente_api', default='', help_text='Resumo (SHA-256) do token que criou o job; o token não é armazenado.', max_length=64, verbose_name='Cliente da API'),
+        ),
+    ]
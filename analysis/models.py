@@ -0,0 +1,217 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.gis.db import models as gis_models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class AnalysisJob(models.Model):
+    """Análise de sobreposição executada em segundo plano (run_analysis_worker)."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Na fila'
+        RUNNING = 'running', 'Em processamento'
+        DONE = 'done', 'Concluída'
+        FAILED = 'failed', 'Com erro'
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name="Situação",
+        db_column='situacao'
+    )
+
+    geometry = gis_models.GeometryField(
+        srid=4674,
+        null=True,
+        blank=True,
+        spatial_index=False,
+        verbose_name="Geometria Analisada",
+        db_column='geometria'
+    )
+
+    car_number = models.CharField(
+        max_length=43,
+        null=True,
+        blank=True,
+        verbose_name="Número do CAR",
+        db_column='numero_car'
+    )
+
+    result = models.JSONField(
+        null=True,
+        blank=True,
+        encoder=DjangoJSONEncoder,
+        verbose_name="Resultado",
+        db_column='resultado'
+    )
+
+    municipality = models.CharField(
+        max_length=100,
+        null=True,
+        blank=True,
+        verbose_name="Município",
+        db_column='municipio'
+    )
+
+    state = models.CharField(
+        max_length=2,
+        null=True,
+        blank=True,
+        verbose_name="UF",
+        db_column='uf'
+    )
+
+    error = models.TextField(
+        blank=True,
+        default='',
+        verbose_name="Erro",
+        db_column='erro'
+    )
+
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Tentativas",
+        db_column='tentativas'
+    )
+
+    worker = models.CharField(
+        max_length=100,
+        blank=True,
+        default='',
+        verbose_name="Worker",
+        db_column='worker'
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Criado em",
+        db_column='criado_em'
+    )
+
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Iniciado em",
+        db_column='iniciado_em'
+    )
+
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Finalizado em",
+        db_column='finalizado_em'
+    )
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='analysis_jobs',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_column='id_criado_por',
+        verbose_name='Criado por'
+    )
+
+    api_client = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        verbose_name="Cliente da API",
+        db_column='cliente_api',
+        help_text="Resumo (SHA-256) do token que criou o job; o token não é armazenado."
+    )
+
+    class Meta:
+        db_table = 'tb_job_analise'
+        verbose_name = "Job de Análise"
+        verbose_name_plural = "Jobs de Análise"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='idx_job_analise_fila'),
+        ]
+
+    def __str__(self):
+        return f"{self.id} ({self.get_status_display()})"
+
+
+class CarOverlap(models.Model):
+    """
+    Sobreposição pré-calculada entre um imóvel do SICAR e uma feição de camada
+    ambiental (manage.py build_car_overlaps, mantida pelos comandos de importação).
+    """
+
+    car = models.ForeignKey(
+        'car_system.SicarRecord',
+        on_delete=models.CASCADE,
+        related_name='overlaps',
+        verbose_name="Imóvel (CAR)",
+        db_column='id_car'
+    )
+
+    layer = models.CharField(
+        max_length=100,
+        verbose_name="Camada",
+        db_column='camada'
+    )
+
+    feature_id = models.BigIntegerField(
+        verbose_name="Feição",
+        db_column='id_feicao'
+    )
+
+    intersection_area_m2 = models.FloatField(
+        verbose_name="Área de Interseção (m²)",
+        db_column='area_intersecao_m2'
+    )
+
+    class Meta:
+        db_table = 'tb_sobreposicao_car'
+        verbose_name = "Sobreposição de CAR"
+        verbose_name_plural = "Sobreposições de CAR"
+        constraints = [
+            models.UniqueConstraint(fields=['car', 'layer', 'feature_id'], name='uq_sobreposicao_car'),
+        ]
+        indexes = [
+            models.Index(fields=['layer', 'feature_id'], name='idx_sobreposicao_car_feicao'),
+        ]
+
+    def __str__(self):
+        return f"{self.car_id} × {self.layer} #{self.feature_id}"
+
+
+class CarOverlapStatus(models.Model):
+    """
+    Momento em que as sobreposições de um CAR foram calculadas. O resultado
+    pré-calculado só é usado se o CAR não foi alterado depois disso.
+    """
+
+    car = models.OneToOneField(
+        'car_system.SicarRecord',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='overlap_status',
+        verbose_name="Imóvel (CAR)",
+        db_column='id_car'
+    )
+
+    computed_at = models.DateTimeField(
+        verbose_name="Calculado em",
+        db_column='calculado_em'
+    )
+
+    class Meta:
+        db_table = 'tb_sobreposicao_car_situacao'
+        verbose_name = "Situação das Sobreposições de CAR"
+        verbose_name_plural = "Situações das Sobreposições de CAR"
+
+    def __str__(self):
+        return f"{self.car_id} ({self.computed_at:%d/%m/%Y %H:%M})"
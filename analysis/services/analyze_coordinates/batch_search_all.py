@@ -0,0 +1,49 @@
+from analysis.services.analyze_coordinates.overlap.batch_overlap_service import BatchOverlapService
+from analysis.services.analyze_coordinates.overlap.final_result_builder import FinalResultBuilder
+from analysis.services.analyze_coordinates.overlap.formatter_register import FormatterRegister
+from analysis.services.analyze_coordinates.overlap.geometry_target import GeometryTarget
+from kernel.service.instrumentation.instrumentation import get_instrumentation
+
+
+class BatchSearchAll:
+    """
+    Batch counterpart of SearchAll: analyses a list of geometries in one
+    set-based pass (BatchOverlapService) and returns, for each geometry,
+    the same structured output SearchAll builds for a single one.
+    """
+
+    def __init__(self, instrumentation=None):
+        self.instrumentation = instrumentation or get_instrumentation()
+        self.builder = FinalResultBuilder()
+        self.formatters = FormatterRegister()
+
+    def execute(self, geometries):
+        layers = list(self.formatters.formatters.keys())
+        formatters = self.formatters.formatters
+
+        with self.instrumentation.span("analysis.target_creation", input_type="Batch"):
+            targets = [GeometryTarget(geometry) for geometry in geometries]
+
+        self.instrumentation.count("analysis.batch_targets", len(targets))
+
+        with self.instrumentation.span("overlap.layer_sql", layer="batch"):
+            rows_by_target = BatchOverlapService(targets).compute_all_layers(layers, formatters)
+
+        outputs = []
+
+        with self.instrumentation.span("analysis.build", input_type="Batch"):
+            for target, rows_by_layer in zip(targets, rows_by_target):
+                results_by_layer = {
+                    layer.__name__: [
+                        formatters[layer].format(row["object"], row)
+                        for row in rows_by_layer[layer.__name__]
+                    ]
+                    for layer in layers
+                }
+                outputs.append(self.builder.build(
+                    target=target,
+                    results_by_layer=results_by_layer,
+                    layers=layers,
+                ))
+
+        return outputs
@@ -0,0 +1,95 @@
+from django.db import connection, transaction
+
+from analysis.services.analyze_coordinates.overlap.overlap_service import OverlapService
+from analysis.services.analyze_coordinates.overlap.single_query_overlap_service import json_fields_sql
+from kernel.service.spatial_sql import CONTAINMENT_FILTER_SQL, layer_containment_sql
+
+
+class BatchOverlapService:
+    """
+    Computes the intersections of many targets (e.g. every polygon of an
+    uploaded shapefile) in one set-based pass.
+
+    The targets are copied into a temporary table with its own GiST index
+    and each layer is resolved with a single spatial join against it, so
+    the cost is one query per layer instead of one analysis per target.
+    """
+
+    TARGETS_TABLE = "analysis_batch_targets"
+
+    def __init__(self, targets):
+        """targets: list of GeometryTarget"""
+        self.targets = targets
+        self.services = [OverlapService(target) for target in targets]
+
+    def compute_all_layers(self, layers, formatters):
+        """
+        Returns one dict { "LayerName": [ {...}, {...} ] } per target, in the
+        order of `targets`, with rows in the format expected by formatters.
+        """
+        results = [{layer.__name__: [] for layer in layers} for _ in self.targets]
+
+        if not self.targets or not layers:
+            return results
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            self._load_targets(cursor)
+
+            for layer in layers:
+                cursor.execute(self._layer_sql(layer, formatters[layer].fields))
+
+                for target_index, obj_id, inter_area_m2, layer_area_ha, fields in cursor.fetchall():
+                    obj = layer(id=obj_id, area_ha=layer_area_ha, **(fields or {}))
+                    service = self.services[target_index]
+                    results[target_index][layer.__name__].append(service._build_row(obj, inter_area_m2))
+
+        return results
+
+    # -----------------------------------------------------------
+    # SQL helpers
+    # -----------------------------------------------------------
+    def _load_targets(self, cursor):
+        qn = connection.ops.quote_name
+        table = qn(self.TARGETS_TABLE)
+
+        cursor.execute(f"""
+            CREATE TEMP TABLE {table} (
+                target_index integer PRIMARY KEY,
+                geom geometry,
+                geom_utm geometry,
+                area_m2 double precision
+            ) ON COMMIT DROP
+        """)
+
+        # Text COPY: geometry input accepts hex EWKB
+        with cursor.copy(f"COPY {table} (target_index, geom, geom_utm, area_m2) FROM STDIN") as copy:
+            for index, target in enumerate(self.targets):
+                copy.write_row((
+                    index,
+                    target.geometry.hexewkb.decode(),
+                    target.geometry_utm.hexewkb.decode(),
+                    target.area_m2,
+                ))
+
+        cursor.execute(f"CREATE INDEX ON {table} USING gist (geom)")
+        cursor.execute(f"ANALYZE {table}")
+
+    def _layer_sql(self, layer, field_names):
+        qn = connection.ops.quote_name
+        meta = layer._meta
+        geom_column = qn(meta.get_field("geometry_new").column)
+
+        return f"""
+            SELECT
+                t.target_index,
+                l.id,
+                a.intersection_area_m2,
+                l.{qn(meta.get_field("area_ha").column)} AS layer_area_ha,
+                {json_fields_sql(layer, field_names)} AS fields
+            FROM {qn(self.TARGETS_TABLE)} t
+            JOIN {qn(meta.db_table)} l
+              ON ST_Intersects(l.{geom_column}, t.geom)
+            {layer_containment_sql(layer)}
+            WHERE {CONTAINMENT_FILTER_SQL}
+            ORDER BY t.target_index, l.id
+        """
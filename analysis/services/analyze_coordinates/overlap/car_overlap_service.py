@@ -0,0 +1,375 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.db import connection, transaction
+
+from analysis.models import CarOverlap, CarOverlapStatus
+from analysis.services.analyze_coordinates.overlap.formatter_register import FormatterRegister
+from analysis.services.analyze_coordinates.overlap.overlap_service import OverlapService
+from analysis.services.analyze_coordinates.overlap.single_query_overlap_service import json_fields_sql
+from car_system.models import SicarRecord
+from kernel.service.import_engine.geometry_columns import UTM_SRID
+from kernel.service.spatial_sql import CONTAINMENT_FILTER_SQL, layer_containment_sql
+
+
+class CarOverlapService:
+    """
+    Precomputed overlaps between every SicarRecord and the environmental
+    layers (CarOverlap rows: CAR, layer label, feature id, intersection area).
+
+    - rebuild(): set-based spatial join of all CARs against every layer,
+      partitioned by CAR id ranges and run in parallel (one connection per
+      worker, each partition committed on its own)
+    - sync(): called by the import commands (and convert); recomputes the
+      CARs written since the import started, or, for a layer, the CARs whose
+      bbox touches a changed feature or that referenced one (removed
+      features are dropped)
+    - sync_record(): the same for a single saved row (post_save, see
+      analysis.signals), so admin edits are picked up
+    - results(): formatted rows of a CAR read from the table, used by
+      SearchAll while neither the CAR nor a layer feature around it changed
+      after its overlaps were computed (CarOverlapStatus)
+
+    CAR x CAR overlaps are not precomputed: they change with every SICAR
+    import and are still analysed live.
+    """
+
+    AFFECTED_TABLE = "car_overlap_affected"
+
+    def __init__(self, layers=None, partition_size=5000, workers=1):
+        self.layers = layers if layers is not None else self.default_layers()
+        self.partition_size = partition_size
+        self.workers = workers
+
+    @staticmethod
+    def default_layers():
+        return [layer for layer in FormatterRegister().formatters if layer is not SicarRecord]
+
+    def is_built(self):
+        return CarOverlapStatus.objects.exists()
+
+    # -----------------------------------------------------------
+    # Maintenance
+    # -----------------------------------------------------------
+    def rebuild(self, progress=None) -> int:
+        """Recompute every CAR. Returns the number of CARs processed."""
+        qn = connection.ops.quote_name
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"TRUNCATE {qn(CarOverlap._meta.db_table)}, {qn(CarOverlapStatus._meta.db_table)}"
+            )
+
+        return self._run_partitions(progress=progress)
+
+    def sync(self, model, since) -> int:
+        """
+        Incremental update after an import of `model` started at `since`.
+        No-op until the table was built. Returns the number of CARs recomputed.
+        """
+        if not self.is_built():
+            return 0
+
+        if model is SicarRecord:
+            updated_at = connection.ops.quote_name(SicarRecord._meta.get_field("updated_at").column)
+            return self._run_partitions(f"c.{updated_at} >= %s", [since])
+
+        if model in self.layers:
+            updated_at = connection.ops.quote_name(model._meta.get_field("updated_at").column)
+            return self._sync_layer(model, f"f.{updated_at} >= %s", [since])
+
+        return 0
+
+    def sync_record(self, model, pk) -> int:
+        """Incremental update after a single row of `model` was saved. Same return as sync()."""
+        if not self.is_built():
+            return 0
+
+        if model is SicarRecord:
+            return self._run_partitions("c.id = %s", [pk])
+
+        if model in self.layers:
+            return self._sync_layer(model, "f.id = %s", [pk])
+
+        return 0
+
+    def _run_partitions(self, where="TRUE", params=(), progress=None):
+        qn = connection.ops.quote_name
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT min(c.id), max(c.id) FROM {qn(SicarRecord._meta.db_table)} c WHERE {where}",
+                list(params),
+            )
+            first_id, last_id = cursor.fetchone()
+
+        if first_id is None:
+            return 0
+
+        partitions = [
+            (low, min(low + self.partition_size - 1, last_id))
+            for low in range(first_id, last_id + 1, self.partition_size)
+        ]
+        done = 0
+
+        if self.workers <= 1:
+            for low, high in partitions:
+                done += self._compute_partition(low, high, where, params)
+                if progress:
+                    progress(done, high, last_id)
+            return done
+
+        # Connections are per thread: release the caller's before the workers start
+        connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(self._compute_partition_in_thread, low, high, where, params): high
+                for low, high in partitions
+            }
+
+            for future in as_completed(futures):
+                done += future.result()
+                if progress:
+                    progress(done, futures[future], last_id)
+
+        return done
+
+    def _compute_partition_in_thread(self, low, high, where, params):
+        try:
+            return self._compute_partition(low, high, where, params)
+        finally:
+            connection.close()
+
+    def _compute_partition(self, low, high, where, params) -> int:
+        """Recompute the CARs with id in [low, high] matching `where`, for every layer."""
+        qn = connection.ops.quote_name
+        car_filter = f"c.id BETWEEN %s AND %s AND ({where})"
+        car_params = [low, high, *params]
+        labels = [layer._meta.label for layer in self.layers]
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"""
+                DELETE FROM {qn(CarOverlap._meta.db_table)} o
+                USING {qn(SicarRecord._meta.db_table)} c
+                WHERE o.id_car = c.id
+                  AND o.camada = ANY(%s)
+                  AND {car_filter}
+            """, [labels, *car_params])
+
+            for layer in self.layers:
+                cursor.execute(self._insert_sql(layer, car_filter), [layer._meta.label, *car_params])
+
+            cursor.execute(f"""
+                INSERT INTO {qn(CarOverlapStatus._meta.db_table)} (id_car, calculado_em)
+                SELECT c.id, now()
+                FROM {qn(SicarRecord._meta.db_table)} c
+                WHERE {car_filter}
+                ON CONFLICT (id_car) DO UPDATE SET calculado_em = EXCLUDED.calculado_em
+            """, car_params)
+
+            return cursor.rowcount
+
+    def _sync_layer(self, layer, feature_filter, params) -> int:
+        """Recompute (CAR, layer) for the CARs affected by the features matching `feature_filter` (alias f)."""
+        qn = connection.ops.quote_name
+        overlap_table = qn(CarOverlap._meta.db_table)
+        status_table = qn(CarOverlapStatus._meta.db_table)
+        affected = qn(self.AFFECTED_TABLE)
+        label = layer._meta.label
+
+        layer_table = qn(layer._meta.db_table)
+        layer_geom = qn(layer._meta.get_field("geometry_new").column)
+        car_geom = qn(SicarRecord._meta.get_field("geometry_new").column)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            # CARs whose bbox touches a changed feature (new geometry) or that
+            # overlapped one of them (old geometry)
+            cursor.execute(f"""
+                CREATE TEMP TABLE {affected} ON COMMIT DROP AS
+                SELECT c.id
+                FROM {qn(SicarRecord._meta.db_table)} c
+                JOIN {layer_table} f ON c.{car_geom} && f.{layer_geom}
+                WHERE {feature_filter}
+                UNION
+                SELECT o.id_car
+                FROM {overlap_table} o
+                JOIN {layer_table} f ON f.id = o.id_feicao
+                WHERE o.camada = %s
+                  AND {feature_filter}
+            """, [*params, label, *params])
+            affected_cars = cursor.rowcount
+
+            # Features removed by the import (--delete-missing)
+            cursor.execute(f"""
+                DELETE FROM {overlap_table} o
+                WHERE o.camada = %s
+                  AND NOT EXISTS (SELECT 1 FROM {layer_table} f WHERE f.id = o.id_feicao)
+            """, [label])
+
+            cursor.execute(f"""
+                DELETE FROM {overlap_table} o
+                USING {affected} x
+                WHERE o.id_car = x.id
+                  AND o.camada = %s
+            """, [label])
+
+            cursor.execute(
+                self._insert_sql(layer, f"c.id IN (SELECT id FROM {affected})"),
+                [label],
+            )
+
+            # The CARs are up to date again unless the CAR itself or a feature
+            # of another layer around it also changed since they were computed
+            car_updated_at = qn(SicarRecord._meta.get_field("updated_at").column)
+            others = [other for other in self.layers if other is not layer]
+            others_changed, others_params = self._layers_changed_sql(others, "s.calculado_em")
+            cursor.execute(f"""
+                UPDATE {status_table} s
+                SET calculado_em = now()
+                FROM {affected} x
+                JOIN {qn(SicarRecord._meta.db_table)} c ON c.id = x.id
+                WHERE s.id_car = x.id
+                  AND c.{car_updated_at} <= s.calculado_em
+                  AND NOT ({others_changed})
+            """, others_params)
+
+        return affected_cars
+
+    def _layers_changed_sql(self, layers, since_sql, since_params=()):
+        """
+        Condition (and its parameters) true when a feature of `layers` written
+        at or after `since_sql` touches the bbox of the CAR aliased c or was
+        one of its overlaps.
+        """
+        qn = connection.ops.quote_name
+        car_geom = qn(SicarRecord._meta.get_field("geometry_new").column)
+        conditions = []
+        params = []
+
+        for layer in layers:
+            meta = layer._meta
+            conditions.append(f"""
+                EXISTS (
+                    SELECT 1
+                    FROM {qn(meta.db_table)} f
+                    WHERE f.{qn(meta.get_field("updated_at").column)} >= {since_sql}
+                      AND (
+                          f.{qn(meta.get_field("geometry_new").column)} && c.{car_geom}
+                          OR f.id IN (
+                              SELECT o.id_feicao
+                              FROM {qn(CarOverlap._meta.db_table)} o
+                              WHERE o.id_car = c.id
+                                AND o.camada = %s
+                          )
+                      )
+                )
+            """)
+            params += [*since_params, meta.label]
+
+        return " OR ".join(conditions) or "FALSE", params
+
+    def _insert_sql(self, layer, car_filter):
+        """
+        INSERT of the overlaps between the CARs matching `car_filter` (alias c)
+        and one layer. The first parameter is the layer label.
+        """
+        qn = connection.ops.quote_name
+        meta = SicarRecord._meta
+        car_geom = f"c.{qn(meta.get_field('geometry_new').column)}"
+        car_utm = f"ST_Transform({car_geom}, {UTM_SRID})"
+
+        if SicarRecord.stores_projected_geometry():
+            car_utm = f"COALESCE(c.{qn(meta.get_field('geometry_utm').column)}, {car_utm})"
+
+        layer_geom = qn(layer._meta.get_field("geometry_new").column)
+
+        # Each CAR is the "target" of the shared containment fragment
+        return f"""
+            INSERT INTO {qn(CarOverlap._meta.db_table)} (id_car, camada, id_feicao, area_intersecao_m2)
+            SELECT t.id, %s, l.id, a.intersection_area_m2
+            FROM (
+                SELECT
+                    c.id,
+                    {car_geom} AS geom,
+                    {car_utm} AS geom_utm,
+                    COALESCE(c.{qn(meta.get_field('area_m2').column)}, ST_Area({car_utm})) AS area_m2
+                FROM {qn(meta.db_table)} c
+                WHERE {car_geom} IS NOT NULL
+                  AND {car_filter}
+            ) t
+            JOIN {qn(layer._meta.db_table)} l ON ST_Intersects(l.{layer_geom}, t.geom)
+            {layer_containment_sql(layer)}
+            WHERE {CONTAINMENT_FILTER_SQL}
+        """
+
+    # -----------------------------------------------------------
+    # Lookup
+    # -----------------------------------------------------------
+    def results(self, target, formatters):
+        """
+        { "LayerName": [formatted rows] } of the precomputed layers for
+        target.car, or None when its overlaps are missing or outdated.
+        """
+        car = target.car
+
+        if not self.layers:
+            return {}
+
+        computed_at = (
+            CarOverlapStatus.objects
+            .filter(car_id=car.id)
+            .values_list("computed_at", flat=True)
+            .first()
+        )
+
+        if computed_at is None or computed_at < car.updated_at:
+            return None
+
+        qn = connection.ops.quote_name
+
+        # Layer features changed after the CAR was computed and not synced yet
+        # (writes outside the import commands, convert and post_save)
+        layers_changed, changed_params = self._layers_changed_sql(self.layers, "%s", [computed_at])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {layers_changed} FROM {qn(SicarRecord._meta.db_table)} c WHERE c.id = %s",
+                [*changed_params, car.id],
+            )
+            if cursor.fetchone()[0]:
+                return None
+
+        branches = []
+        params = []
+
+        for position, layer in enumerate(self.layers):
+            meta = layer._meta
+            branches.append(f"""
+                (
+                    SELECT
+                        %s AS layer_position,
+                        l.id AS id,
+                        o.area_intersecao_m2,
+                        l.{qn(meta.get_field("area_ha").column)} AS layer_area_ha,
+                        {json_fields_sql(layer, formatters[layer].fields)} AS fields
+                    FROM {qn(CarOverlap._meta.db_table)} o
+                    JOIN {qn(meta.db_table)} l ON l.id = o.id_feicao
+                    WHERE o.id_car = %s
+                      AND o.camada = %s
+                )
+            """)
+            params += [position, car.id, meta.label]
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"{' UNION ALL '.join(branches)} ORDER BY layer_position, id", params)
+            rows = cursor.fetchall()
+
+        service = OverlapService(target)
+        results = {layer.__name__: [] for layer in self.layers}
+
+        for layer_position, obj_id, inter_area_m2, layer_area_ha, fields in rows:
+            layer = self.layers[layer_position]
+            obj = layer(id=obj_id, area_ha=layer_area_ha, **(fields or {}))
+            row = service._build_row(obj, inter_area_m2)
+            results[layer.__name__].append(formatters[layer].format(obj, row))
+
+        return results
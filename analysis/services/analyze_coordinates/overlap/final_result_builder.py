@@ -1,3 +1,6 @@
+from control_panel.services.layer_statistics_service import LayerStatisticsService
+
+
 class FinalResultBuilder:
 
     def build(self, target, results_by_layer, layers):
@@ -20,19 +23,10 @@ class FinalResultBuilder:
             layer_name = layer.__name__
             records = results_by_layer.get(layer_name, [])
 
-            bases_output.append({
-                "nome_base": self._base_name(layer),
-                "areas_encontradas": records,
-                "quantidade_nao_avaliados": 0,
-                "total_areas_com_sobreposicao": len(records),
-            })
-
+            bases_output.append(self.layer_block(layer, records))
             all_areas.extend(records)
 
-        summary_counts = {
-            self._base_name(layer): layer.objects.count()
-            for layer in layers
-        }
+        summary_counts = self.summary_counts(layers)
 
         return {
             "resultados_por_base": bases_output,
@@ -43,6 +37,23 @@ class FinalResultBuilder:
             "resumo_bases": summary_counts,
         }
 
+    def layer_block(self, layer, records):
+        """Result block of a single layer (one entry of "resultados_por_base")."""
+        return {
+            "nome_base": self._base_name(layer),
+            "areas_encontradas": records,
+            "quantidade_nao_avaliados": 0,
+            "total_areas_com_sobreposicao": len(records),
+        }
+
+    def summary_counts(self, layers):
+        """{ base name: number of rows in the layer } ("resumo_bases")."""
+        layer_counts = LayerStatisticsService().counts(layers)
+        return {
+            self._base_name(layer): layer_counts[layer]
+            for layer in layers
+        }
+
     def _base_name(self, layer):
         mapping = {
             "SicarRecord": "Base de Dados Sicar",
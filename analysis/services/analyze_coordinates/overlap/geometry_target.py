@@ -4,9 +4,10 @@ class GeometryTarget:
 
     def __init__(self, geometry: GEOSGeometry):
         self.geometry = geometry
-        self.area_m2, self.area_ha = self._compute_area(geometry)
+        # Projected once; reused by the engines for layers with a stored UTM geometry
+        self.geometry_utm = geometry.transform(31982, clone=True)
+        self.area_m2, self.area_ha = self._compute_area(self.geometry_utm)
 
-    def _compute_area(self, geom):
-        geom_utm = geom.transform(31982, clone=True)
+    def _compute_area(self, geom_utm):
         area_m2 = geom_utm.area
         return area_m2, area_m2 / 10000
@@ -1,8 +1,14 @@
 from django.contrib.gis.geos import GEOSGeometry
-from django.contrib.gis.db.models.functions import Intersection
-from django.db.models import F
+from django.contrib.gis.db.models import GeometryField
+from django.contrib.gis.db.models.functions import Intersection, Transform
+from django.db import connection
+from django.db.models import Case, F, FloatField, Func, Value, When
+from django.db.models.functions import Coalesce
 import pandas as pd
 
+from kernel.service.spatial_sql import TARGET_CTE_SQL, target_params
+from kernel.service.subdivision.layer_subdivision_service import LayerSubdivisionService
+
 UTM_SRID = 31982  # SIRGAS 2000 / UTM 22S
 
 
@@ -11,6 +17,11 @@ class OverlapService:
     Service responsible for checking overlaps between a geographic target
     (CAR or external polygon) and environmental layers stored in the database.
     Uses precomputed fields (area_m2, area_ha) for maximum efficiency.
+
+    Candidates are first classified with ST_Covers / ST_CoveredBy: when one
+    geometry contains the other, the intersection is the smaller one and its
+    precomputed area is reused, so ST_Intersection only runs for partial
+    overlaps.
     """
 
     def __init__(self, target):
@@ -21,6 +32,7 @@ class OverlapService:
         self.target_geom = target.geometry
         self.target_area_m2 = target.area_m2
         self.target_area_ha = target.area_ha
+        self.subdivision = LayerSubdivisionService()
 
         if self.target_geom is None:
             raise ValueError("The provided geometry is invalid.")
@@ -37,15 +49,49 @@ class OverlapService:
     # -----------------------------------------------------------
     # Compute intersections
     # -----------------------------------------------------------
-    def compute_intersections(self, layer_model):
+    def compute_intersections(self, layer_model, fields=None, include_geometry=True):
         """
         Computes intersections between the target geometry and a layer.
-        Intersection geometry is transformed to UTM for precise area calculation.
+
+        fields: optional model field names to load (e.g. the ones a formatter
+        declares). The loaded instance is returned under "object", so callers
+        never need to fetch it again.
+
+        include_geometry: when False, the intersection area (UTM) and the percent
+        overlap are computed by PostGIS and the intersection geometry is never
+        sent over the wire ("intersection_geom" is None). When True, the geometry
+        is fetched and its area is computed locally.
+
+        Layers with a built `_subdivided` table (see LayerSubdivisionService)
+        are intersected piece by piece and re-aggregated per feature.
         """
-        qs = (
-            layer_model.objects
-            .filter(geometry_new__intersects=self.target_geom)
-            .annotate(intersection=Intersection(F("geometry_new"), self.target_geom))
+        if not include_geometry and self.subdivision.is_enabled(layer_model):
+            return self._compute_subdivided(layer_model, fields)
+
+        qs = layer_model.objects.filter(geometry_new__intersects=self.target_geom)
+
+        if fields is not None:
+            qs = qs.only("id", "area_ha", *fields)
+        elif not include_geometry:
+            qs = qs.defer("geometry", "geometry_new", "geometry_utm")
+        else:
+            qs = qs.defer("geometry_utm")
+
+        if include_geometry:
+            return self._compute_with_geometry(qs)
+
+        return self._compute_in_database(qs)
+
+    def _compute_with_geometry(self, qs):
+        """Fetch each intersection geometry and compute its area in UTM."""
+        geometry_field = GeometryField(srid=self.target_geom.srid)
+        qs = qs.annotate(
+            intersection=Case(
+                When(geometry_new__covers=self.target_geom, then=Value(self.target_geom, output_field=geometry_field)),
+                When(geometry_new__coveredby=self.target_geom, then=F("geometry_new")),
+                default=Intersection(F("geometry_new"), self.target_geom),
+                output_field=geometry_field,
+            )
         )
 
         results = []
@@ -57,26 +103,86 @@ class OverlapService:
 
             # Compute intersection area using UTM projection
             inter_utm = inter.transform(UTM_SRID, clone=True)
-            inter_area_m2 = inter_utm.area
-            inter_area_ha = inter_area_m2 / 10000
 
-            # Percent overlap relative to the target area
+            results.append(self._build_row(obj, inter_utm.area, intersection_geom=inter))
+
+        return results
+
+    def _compute_in_database(self, qs):
+        """
+        Annotate the intersection area directly in PostGIS. The percent overlap
+        is derived in Python: an annotation referencing another one repeats
+        its whole expression in the SQL.
+        """
+        def utm_area(expression):
+            return Func(Transform(expression, UTM_SRID), function="ST_Area", output_field=FloatField())
+
+        if qs.model.stores_projected_geometry():
+            # Intersect in UTM: stored copy against the target projected once
+            projected = Coalesce(F("geometry_utm"), Transform(F("geometry_new"), UTM_SRID))
+            partial_area = Func(
+                Intersection(projected, self.target.geometry_utm),
+                function="ST_Area",
+                output_field=FloatField(),
+            )
+        else:
+            partial_area = utm_area(Intersection(F("geometry_new"), self.target_geom))
+
+        intersection_area_m2 = Case(
+            When(geometry_new__covers=self.target_geom, then=Value(self.target_area_m2)),
+            When(geometry_new__coveredby=self.target_geom, then=Coalesce(F("area_m2"), utm_area(F("geometry_new")))),
+            default=partial_area,
+            output_field=FloatField(),
+        )
+
+        qs = qs.annotate(intersection_area_m2=intersection_area_m2)
+
+        return [self._build_row(obj, obj.intersection_area_m2) for obj in qs]
+
+    def _compute_subdivided(self, layer_model, fields=None):
+        """Intersection areas summed over the subdivided pieces of each feature."""
+        sql = f"""
+            WITH {TARGET_CTE_SQL}
+            {self.subdivision.intersection_sql(layer_model)}
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, target_params(self.target))
+            areas = dict(cursor.fetchall())
+
+        if not areas:
+            return []
+
+        qs = layer_model.objects.filter(id__in=areas.keys()).order_by("id")
+
+        if fields is not None:
+            qs = qs.only("id", "area_ha", *fields)
+        else:
+            qs = qs.defer("geometry", "geometry_new", "geometry_utm")
+
+        return [self._build_row(obj, areas[obj.id]) for obj in qs]
+
+    def _build_row(self, obj, inter_area_m2, percent_overlap=None, intersection_geom=None):
+        """Build a single intersection row in the format expected by formatters."""
+        inter_area_m2 = inter_area_m2 or 0
+
+        # Percent overlap relative to the target area
+        if percent_overlap is None:
             percent_overlap = (
                 (inter_area_m2 / self.target_area_m2) * 100
                 if self.target_area_m2 > 0 else 0
             )
 
-            results.append({
-                "id": obj.id,
-                "intersection_area_m2": inter_area_m2,
-                "intersection_area_ha": inter_area_ha,
-                "percent_overlap": percent_overlap,
-                "layer_area_ha": getattr(obj, "area_ha", None),
-                "target_area_ha": self.target_area_ha,
-                "intersection_geom": inter,
-            })
-
-        return results
+        return {
+            "id": obj.id,
+            "object": obj,
+            "intersection_area_m2": inter_area_m2,
+            "intersection_area_ha": inter_area_m2 / 10000,
+            "percent_overlap": percent_overlap,
+            "layer_area_ha": getattr(obj, "area_ha", None),
+            "target_area_ha": self.target_area_ha,
+            "intersection_geom": intersection_geom,
+        }
 
     # -----------------------------------------------------------
     # Compute intersections across multiple layers
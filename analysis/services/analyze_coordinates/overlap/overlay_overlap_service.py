@@ -0,0 +1,70 @@
+from django.db import connection
+
+from analysis.services.analyze_coordinates.overlap.overlap_service import OverlapService
+from analysis.services.analyze_coordinates.overlap.single_query_overlap_service import json_fields_sql
+from kernel.service.overlay.layer_overlay_service import LayerOverlayService
+from kernel.service.spatial_sql import TARGET_CTE_SQL, target_params
+
+
+class OverlayOverlapService(OverlapService):
+    """
+    Computes the intersections of the overlay layers (LAYER_OVERLAY_LAYERS)
+    with one intersection of the target against the planar overlay built by
+    LayerOverlayService, instead of one overlay query per layer.
+
+    The per-feature areas are joined back to each layer table in the same
+    statement to load the columns its formatter declares.
+    """
+
+    def __init__(self, target):
+        super().__init__(target)
+        self.overlay = LayerOverlayService()
+
+    def compute_all_layers(self, layers, formatters):
+        """
+        Returns a dict { "LayerName": [ {...}, {...} ] } with one entry per
+        layer (empty lists included), like SingleQueryOverlapService.
+        """
+        results = {layer.__name__: [] for layer in layers}
+
+        if not layers:
+            return results
+
+        qn = connection.ops.quote_name
+        branches = []
+        params = target_params(self.target) + [[layer._meta.label for layer in layers]]
+
+        for position, layer in enumerate(layers):
+            meta = layer._meta
+            branches.append(f"""
+                (
+                    SELECT
+                        %s AS layer_position,
+                        l.id AS id,
+                        x.intersection_area_m2,
+                        l.{qn(meta.get_field("area_ha").column)} AS layer_area_ha,
+                        {json_fields_sql(layer, formatters[layer].fields)} AS fields
+                    FROM areas x
+                    JOIN {qn(meta.db_table)} l ON l.id = x.feature_id
+                    WHERE x.layer = %s
+                )
+            """)
+            params += [position, meta.label]
+
+        sql = f"""
+            WITH {TARGET_CTE_SQL},
+            areas AS ({self.overlay.intersection_sql()})
+            {" UNION ALL ".join(branches)}
+            ORDER BY layer_position, id
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        for layer_position, obj_id, inter_area_m2, layer_area_ha, fields in rows:
+            layer = layers[layer_position]
+            obj = layer(id=obj_id, area_ha=layer_area_ha, **(fields or {}))
+            results[layer.__name__].append(self._build_row(obj, inter_area_m2))
+
+        return results
@@ -1,75 +1,254 @@
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from django.conf import settings
+from django.db import connection
 from analysis.services.analyze_coordinates.overlap.overlap_service import OverlapService
+from analysis.services.analyze_coordinates.overlap.overlay_overlap_service import OverlayOverlapService
+from analysis.services.analyze_coordinates.overlap.single_query_overlap_service import SingleQueryOverlapService
+from analysis.services.analyze_coordinates.overlap.target_tiler import TargetTiler
+from kernel.service.instrumentation.instrumentation import get_instrumentation
+from kernel.service.overlay.layer_overlay_service import LayerOverlayService
+
+ENGINE_PER_LAYER = "per_layer"
+ENGINE_SINGLE_QUERY = "single_query"
+ENGINE_OVERLAY = "overlay"
 
 
 class OverlapPipeline:
     """
     Pipeline responsible for orchestrating overlap computation
     and applying formatters to each environmental layer.
+
+    Engines:
+    - "per_layer": one PostGIS query per layer (default), optionally
+      running the layers in parallel (OVERLAP_MAX_WORKERS)
+    - "single_query": all layers in a single UNION ALL statement
+    - "overlay": the layers of the planar overlay (LayerOverlayService) in
+      a single intersection against it, the others per layer; behaves as
+      "per_layer" while the overlay is not built
+
+    Huge targets (see TargetTiler) are split into tiles that run through the
+    engine in parallel (OVERLAP_TILE_WORKERS), each with its own short
+    queries; the per-feature areas are summed back over the tiles.
+
+    Timings and row counts are reported through the instrumentation API
+    (spans "overlap.*", counters "overlap.rows" / "overlap.target_bytes").
     """
 
-    def run(self, target, layers, formatters):
-        print("\n===== OVERLAP PIPELINE START =====")
-        pipeline_start = time.perf_counter()
+    def __init__(self, engine=None, max_workers=None, instrumentation=None, tiler=None, tile_workers=None):
+        self.engine = engine or getattr(settings, "OVERLAP_ENGINE", ENGINE_PER_LAYER)
+        self.max_workers = max_workers or getattr(settings, "OVERLAP_MAX_WORKERS", 1)
+        self.instrumentation = instrumentation or get_instrumentation()
+        self.tiler = tiler or TargetTiler()
+        self.tile_workers = tile_workers or getattr(settings, "OVERLAP_TILE_WORKERS", 4)
 
+        if self.engine not in (ENGINE_PER_LAYER, ENGINE_SINGLE_QUERY, ENGINE_OVERLAY):
+            raise ValueError(f"Unknown overlap engine: {self.engine}")
+
+    def run(self, target, layers, formatters):
+        """Returns { "LayerName": [formatted rows] } in layer order."""
+        results = dict(self.iter_run(target, layers, formatters))
+        return {layer.__name__: results[layer.__name__] for layer in layers}
+
+    def iter_run(self, target, layers, formatters):
+        """
+        Yields (layer name, formatted rows) as soon as each layer is done,
+        in completion order (layer order when sequential). Tiled targets
+        yield every layer at the end, in layer order.
+        """
+        for layer in layers:
+            if formatters.get(layer) is None:
+                raise ValueError(f"No formatter registered for layer: {layer.__name__}")
+
+        self.instrumentation.count(
+            "overlap.target_bytes", len(target.geometry.ewkb), engine=self.engine
+        )
+
+        with self.instrumentation.span("overlap.pipeline", engine=self.engine):
+            if self.tiler.should_tile(target):
+                yield from self._run_tiled(target, layers, formatters)
+            elif self.engine == ENGINE_SINGLE_QUERY:
+                yield from self._run_single_query(target, layers, formatters)
+            elif self.engine == ENGINE_OVERLAY:
+                yield from self._run_overlay(target, layers, formatters)
+            else:
+                yield from self._run_per_layer(target, layers, formatters)
+
+    # ----------------------------------------------------------
+    # Per layer engine
+    # ----------------------------------------------------------
+    def _run_per_layer(self, target, layers, formatters):
+        """
+        Process each layer independently. With max_workers > 1 the layers run
+        concurrently in a bounded thread pool (one DB connection per worker).
+        """
         service = OverlapService(target)
-        result = {}
+        workers = min(self.max_workers, len(layers))
+
+        if workers <= 1:
+            for layer in layers:
+                yield layer.__name__, self._process_layer(service, layer, formatters[layer])
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._process_layer_in_thread, service, layer, formatters[layer]): layer
+                for layer in layers
+            }
+
+            for future in as_completed(futures):
+                yield futures[future].__name__, future.result()
+
+    def _process_layer_in_thread(self, service, layer, formatter):
+        try:
+            return self._process_layer(service, layer, formatter)
+        finally:
+            # Each worker thread opens its own connection; release it
+            connection.close()
+
+    def _process_layer(self, service, layer, formatter):
+        layer_name = layer.__name__
+
+        # ----------------------------------------------------------
+        # 1️⃣ Compute intersections (PostGIS)
+        # ----------------------------------------------------------
+        with self.instrumentation.span("overlap.layer_sql", layer=layer_name):
+            rows = service.compute_intersections(
+                layer, fields=formatter.fields, include_geometry=False
+            )
+
+        self.instrumentation.count("overlap.rows", len(rows), layer=layer_name)
+
+        # ----------------------------------------------------------
+        # 2️⃣ Format results (object was already loaded by compute_intersections)
+        # ----------------------------------------------------------
+        with self.instrumentation.span("overlap.formatting", layer=layer_name):
+            return [formatter.format(row["object"], row) for row in rows]
+
+    # ----------------------------------------------------------
+    # Single query engine
+    # ----------------------------------------------------------
+    def _run_single_query(self, target, layers, formatters):
+        with self.instrumentation.span("overlap.layer_sql", layer="all"):
+            rows_by_layer = SingleQueryOverlapService(target).compute_all_layers(layers, formatters)
 
         for layer in layers:
             layer_name = layer.__name__
-            print(f"\n--- Processing layer: {layer_name} ---")
+            formatter = formatters[layer]
+            rows = rows_by_layer[layer_name]
 
-            layer_start = time.perf_counter()
+            self.instrumentation.count("overlap.rows", len(rows), layer=layer_name)
 
-            formatter = formatters.get(layer)
-            if formatter is None:
-                raise ValueError(f"No formatter registered for layer: {layer_name}")
+            with self.instrumentation.span("overlap.formatting", layer=layer_name):
+                formatted = [formatter.format(row["object"], row) for row in rows]
 
-            # ----------------------------------------------------------
-            # 1️⃣ Compute intersections (PostGIS)
-            # ----------------------------------------------------------
-            t0 = time.perf_counter()
-            rows = service.compute_intersections(layer)
-            t1 = time.perf_counter()
+            yield layer_name, formatted
 
-            print(f"  • Time computing intersections: {t1 - t0:.4f}s "
-                  f"({len(rows)} intersections found)")
+    # ----------------------------------------------------------
+    # Overlay engine
+    # ----------------------------------------------------------
+    def _overlay_layers(self, layers):
+        """Layers answered by the overlay (none while it is not built)."""
+        overlay = LayerOverlayService()
 
-            # ----------------------------------------------------------
-            # 2️⃣ Format results
-            # ----------------------------------------------------------
-            formatted_start = time.perf_counter()
-            formatted_rows = []
+        if not overlay.is_enabled():
+            return []
 
-            for row in rows:
-                # 2.1 Query object from DB
-                q0 = time.perf_counter()
-                obj = layer.objects.get(id=row["id"])
-                q1 = time.perf_counter()
+        overlay_layers = overlay.layers()
+        return [layer for layer in layers if layer in overlay_layers]
 
-                # 2.2 Apply formatter
-                f0 = time.perf_counter()
-                formatted_rows.append(formatter.format(obj, row))
-                f1 = time.perf_counter()
+    def _run_overlay(self, target, layers, formatters):
+        overlay_layers = self._overlay_layers(layers)
 
-                print(f"    - Record ID {row['id']} | "
-                      f"DB fetch: {q1 - q0:.4f}s | "
-                      f"Formatter: {f1 - f0:.4f}s")
+        if overlay_layers:
+            with self.instrumentation.span("overlap.layer_sql", layer="overlay"):
+                rows_by_layer = OverlayOverlapService(target).compute_all_layers(overlay_layers, formatters)
 
-            formatted_end = time.perf_counter()
+            for layer in overlay_layers:
+                layer_name = layer.__name__
+                formatter = formatters[layer]
+                rows = rows_by_layer[layer_name]
 
-            print(f"  • Time formatting rows: {formatted_end - formatted_start:.4f}s")
+                self.instrumentation.count("overlap.rows", len(rows), layer=layer_name)
 
-            # Save results
-            result[layer_name] = formatted_rows
+                with self.instrumentation.span("overlap.formatting", layer=layer_name):
+                    formatted = [formatter.format(row["object"], row) for row in rows]
 
-            layer_end = time.perf_counter()
-            print(f"--- Layer {layer_name} finished in {layer_end - layer_start:.4f}s ---")
+                yield layer_name, formatted
 
-        # ----------------------------------------------------------
-        # END
-        # ----------------------------------------------------------
-        pipeline_end = time.perf_counter()
-        print(f"\n===== OVERLAP PIPELINE FINISHED in {pipeline_end - pipeline_start:.4f}s =====\n")
+        remaining = [layer for layer in layers if layer not in overlay_layers]
+
+        if remaining:
+            yield from self._run_per_layer(target, remaining, formatters)
+
+    # ----------------------------------------------------------
+    # Tiled targets
+    # ----------------------------------------------------------
+    def _run_tiled(self, target, layers, formatters):
+        """
+        Run every tile through the engine (bounded thread pool, one DB
+        connection per worker) and sum the intersection area of each feature
+        over the tiles. Percentages are relative to the whole target.
+        """
+        with self.instrumentation.span("overlap.tiling", engine=self.engine):
+            tiles = self.tiler.split(target)
+
+        self.instrumentation.count("overlap.tiles", len(tiles), engine=self.engine)
 
-        return result
+        # { layer name: { feature id: [object, intersection area m2] } }
+        merged = {layer.__name__: {} for layer in layers}
+
+        with ThreadPoolExecutor(max_workers=min(self.tile_workers, len(tiles))) as executor:
+            futures = [
+                executor.submit(self._process_tile_in_thread, tile, layers, formatters)
+                for tile in tiles
+            ]
+
+            for future in as_completed(futures):
+                for layer_name, rows in future.result().items():
+                    features = merged[layer_name]
+
+                    for row in rows:
+                        feature = features.setdefault(row["id"], [row["object"], 0.0])
+                        feature[1] += row["intersection_area_m2"]
+
+        service = OverlapService(target)
+
+        for layer in layers:
+            layer_name = layer.__name__
+            formatter = formatters[layer]
+            rows = [
+                service._build_row(obj, inter_area_m2)
+                for _, (obj, inter_area_m2) in sorted(merged[layer_name].items())
+            ]
+
+            self.instrumentation.count("overlap.rows", len(rows), layer=layer_name)
+
+            with self.instrumentation.span("overlap.formatting", layer=layer_name):
+                formatted = [formatter.format(row["object"], row) for row in rows]
+
+            yield layer_name, formatted
+
+    def _process_tile_in_thread(self, tile, layers, formatters):
+        """Returns { "LayerName": [rows] } of a single tile (layers run sequentially)."""
+        try:
+            with self.instrumentation.span("overlap.layer_sql", layer="tile"):
+                if self.engine == ENGINE_SINGLE_QUERY:
+                    return SingleQueryOverlapService(tile).compute_all_layers(layers, formatters)
+
+                results = {}
+
+                if self.engine == ENGINE_OVERLAY:
+                    overlay_layers = self._overlay_layers(layers)
+                    results.update(OverlayOverlapService(tile).compute_all_layers(overlay_layers, formatters))
+                    layers = [layer for layer in layers if layer not in overlay_layers]
+
+                service = OverlapService(tile)
+                results.update({
+                    layer.__name__: service.compute_intersections(
+                        layer, fields=formatters[layer].fields, include_geometry=False
+                    )
+                    for layer in layers
+                })
+                return results
+        finally:
+            connection.close()
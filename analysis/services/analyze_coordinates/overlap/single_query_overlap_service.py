@@ -0,0 +1,107 @@
+from django.db import connection
+
+from analysis.services.analyze_coordinates.overlap.overlap_service import OverlapService
+from kernel.service.spatial_sql import CONTAINMENT_FILTER_SQL, TARGET_CTE_SQL, layer_containment_sql, target_params
+
+
+def json_fields_sql(layer, field_names, alias="l"):
+    """json_build_object(...) of the given layer fields, keyed by attname (model kwargs)."""
+    qn = connection.ops.quote_name
+    meta = layer._meta
+
+    pairs = ", ".join(
+        f"'{meta.get_field(name).attname}', {alias}.{qn(meta.get_field(name).column)}"
+        for name in field_names
+    )
+    return f"json_build_object({pairs})"
+
+
+class SingleQueryOverlapService(OverlapService):
+    """
+    Computes the intersections of every registered layer in a single SQL
+    statement (UNION ALL over the layer tables).
+
+    The target geometry is bound once in a CTE and each branch returns the
+    intersection area together with the columns its formatter declares, so
+    a whole analysis costs one round-trip to PostGIS. Features covering or
+    covered by the target skip ST_Intersection (see kernel.service.spatial_sql).
+    """
+
+    # -----------------------------------------------------------
+    # Compute intersections across multiple layers
+    # -----------------------------------------------------------
+    def compute_all_layers(self, layers, formatters):
+        """
+        Execute the intersection analysis for all given layers at once.
+
+        Returns a dict { "LayerName": [ {...}, {...} ] } with one entry per layer
+        (empty lists included). Each row carries an unsaved model instance under
+        "object", populated with the fields declared by the layer formatter.
+        """
+        results = {layer.__name__: [] for layer in layers}
+
+        if not layers:
+            return results
+
+        branches = []
+        params = target_params(self.target)
+
+        for position, layer in enumerate(layers):
+            branches.append(self._layer_branch_sql(layer, formatters[layer].fields))
+            params.append(position)
+
+        sql = f"""
+            WITH {TARGET_CTE_SQL}
+            {" UNION ALL ".join(branches)}
+            ORDER BY layer_position, id
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        for layer_position, obj_id, inter_area_m2, layer_area_ha, fields in rows:
+            layer = layers[layer_position]
+            obj = layer(id=obj_id, area_ha=layer_area_ha, **(fields or {}))
+            results[layer.__name__].append(self._build_row(obj, inter_area_m2))
+
+        return results
+
+    # -----------------------------------------------------------
+    # SQL helpers
+    # -----------------------------------------------------------
+    def _layer_branch_sql(self, layer, field_names):
+        """Build the UNION ALL branch of a single layer (subdivided pieces when available)."""
+        qn = connection.ops.quote_name
+        meta = layer._meta
+        geom_column = qn(meta.get_field("geometry_new").column)
+
+        if self.subdivision.is_enabled(layer):
+            return f"""
+                (
+                    SELECT
+                        %s AS layer_position,
+                        l.id AS id,
+                        x.intersection_area_m2,
+                        l.{qn(meta.get_field("area_ha").column)} AS layer_area_ha,
+                        {json_fields_sql(layer, field_names)} AS fields
+                    FROM ({self.subdivision.intersection_sql(layer)}) x
+                    JOIN {qn(meta.db_table)} l ON l.id = x.source_id
+                )
+            """
+
+        return f"""
+            (
+                SELECT
+                    %s AS layer_position,
+                    l.id AS id,
+                    a.intersection_area_m2,
+                    l.{qn(meta.get_field("area_ha").column)} AS layer_area_ha,
+                    {json_fields_sql(layer, field_names)} AS fields
+                FROM {qn(meta.db_table)} l
+                CROSS JOIN target t
+                {layer_containment_sql(layer)}
+                WHERE ST_Intersects(l.{geom_column}, t.geom)
+                  AND {CONTAINMENT_FILTER_SQL}
+            )
+        """
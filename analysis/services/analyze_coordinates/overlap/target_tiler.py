@@ -0,0 +1,93 @@
+from django.conf import settings
+from django.contrib.gis.geos import GEOSGeometry
+import shapely
+
+from analysis.services.analyze_coordinates.overlap.geometry_target import GeometryTarget
+
+
+class TargetTiler:
+    """
+    Splits huge target polygons into tiles for the overlap engines.
+
+    Targets above OVERLAP_TILE_MAX_VERTICES vertices (or OVERLAP_TILE_MAX_AREA_HA
+    hectares, when set) are cut along an adaptive quadtree: a tile is split in
+    four while it is still above the thresholds, up to OVERLAP_TILE_MAX_DEPTH
+    levels. Dense parts of the outline get small tiles, empty quadrants none.
+
+    The tiles partition the target (they only share edges), so summing the
+    intersection areas of a feature over all tiles gives its intersection
+    area with the whole target.
+    """
+
+    def __init__(self, max_vertices=None, max_area_ha=None, max_depth=None):
+        self.max_vertices = max_vertices or getattr(settings, "OVERLAP_TILE_MAX_VERTICES", 0)
+        self.max_area_ha = max_area_ha or getattr(settings, "OVERLAP_TILE_MAX_AREA_HA", 0)
+        self.max_depth = max_depth or getattr(settings, "OVERLAP_TILE_MAX_DEPTH", 4)
+
+    # -----------------------------------------------------------
+    # Thresholds
+    # -----------------------------------------------------------
+    def should_tile(self, target):
+        return self._too_large(target.geometry.num_points, target.area_ha)
+
+    def _too_large(self, vertices, area_ha):
+        if self.max_vertices and vertices > self.max_vertices:
+            return True
+        return bool(self.max_area_ha) and area_ha > self.max_area_ha
+
+    # -----------------------------------------------------------
+    # Split
+    # -----------------------------------------------------------
+    def split(self, target):
+        """Returns a list of GeometryTarget tiles (just [target] when it is small enough)."""
+        if not self.should_tile(target):
+            return [target]
+
+        srid = target.geometry.srid
+        geom = shapely.from_wkb(bytes(target.geometry.wkb))
+
+        # Intersection with the tile boxes needs valid input
+        if not shapely.is_valid(geom):
+            geom = shapely.make_valid(geom)
+
+        tiles = []
+        self._split(geom, shapely.bounds(geom), 0, srid, tiles)
+        return tiles
+
+    def _split(self, geom, bounds, depth, srid, tiles):
+        piece = self._polygonal(shapely.intersection(geom, shapely.box(*bounds)))
+
+        if piece is None:
+            return
+
+        tile = GeometryTarget(GEOSGeometry(memoryview(shapely.to_wkb(piece)), srid=srid))
+
+        if depth >= self.max_depth or not self._too_large(tile.geometry.num_points, tile.area_ha):
+            tiles.append(tile)
+            return
+
+        xmin, ymin, xmax, ymax = bounds
+        xmid, ymid = (xmin + xmax) / 2, (ymin + ymax) / 2
+
+        for quadrant in (
+            (xmin, ymin, xmid, ymid),
+            (xmid, ymin, xmax, ymid),
+            (xmin, ymid, xmid, ymax),
+            (xmid, ymid, xmax, ymax),
+        ):
+            # Recurse on the clipped piece: each level only handles its own vertices
+            self._split(piece, quadrant, depth + 1, srid, tiles)
+
+    @staticmethod
+    def _polygonal(geom):
+        """Polygonal part of a clip result (edges and corners touching the box are dropped)."""
+        # Two levels: collections may hold multipolygons
+        polygons = [
+            part for part in shapely.get_parts(shapely.get_parts(geom))
+            if isinstance(part, shapely.Polygon) and not part.is_empty
+        ]
+
+        if not polygons:
+            return None
+
+        return shapely.MultiPolygon(polygons)
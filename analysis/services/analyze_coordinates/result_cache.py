@@ -0,0 +1,263 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+
+
+class BaseResultCache:
+    """Interface of the analysis result cache backends."""
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl):
+        raise NotImplementedError
+
+
+class NullResultCache(BaseResultCache):
+    """Disabled cache: never stores anything."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+
+class LocalMemoryResultCache(BaseResultCache):
+    """Per-process cache with LRU eviction. Values are stored pickled, so callers never share objects."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, payload = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+
+        return pickle.loads(payload)
+
+    def set(self, key, value, ttl):
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        expires_at = time.monotonic() + ttl if ttl else None
+
+        with self._lock:
+            self._entries[key] = (expires_at, payload)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class FileSystemResultCache(BaseResultCache):
+    """
+    Cache shared by every worker on the host, one file per entry: the expiry
+    time pickled first, then the value, so sweeps read only the header.
+
+    Every set() lists the directory; above max_entries (or every
+    SWEEP_INTERVAL seconds) expired entries, unreadable files and temporary
+    files left by crashed writers are removed, then the oldest entries until
+    the limit is met. Entries keyed by old layer data versions are never read
+    again, so without the sweep they would pile up on disk.
+    """
+
+    SUFFIX = ".pickle"
+    SWEEP_INTERVAL = 300
+    # Temporary files older than this belong to a writer that died
+    ORPHAN_AGE = 3600
+
+    def __init__(self, location, max_entries=256):
+        self.location = location
+        self.max_entries = max_entries
+        self._last_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        path = self._path(key)
+
+        try:
+            with open(path, "rb") as f:
+                expires_at = self._read_expiry(f)
+
+                if expires_at is not None and expires_at < time.time():
+                    value = None
+                else:
+                    return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated, older format or no longer importable classes: a miss
+            value = None
+
+        self._remove(path)
+        return value
+
+    def set(self, key, value, ttl):
+        os.makedirs(self.location, exist_ok=True)
+
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        expires_at = time.time() + ttl if ttl else None
+
+        with open(tmp_path, "wb") as f:
+            pickle.dump(expires_at, f, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+
+        # Atomic on POSIX: concurrent readers never see a partial file
+        os.replace(tmp_path, path)
+
+        self._cull()
+
+    # -----------------------------------------------------------
+    # Eviction
+    # -----------------------------------------------------------
+    def _cull(self):
+        with os.scandir(self.location) as scan:
+            files = [entry for entry in scan if entry.is_file()]
+
+        entries = [entry for entry in files if entry.name.endswith(self.SUFFIX)]
+        now = time.time()
+
+        with self._lock:
+            if len(entries) <= self.max_entries and now - self._last_sweep < self.SWEEP_INTERVAL:
+                return
+            self._last_sweep = now
+
+        kept = []
+
+        for entry in files:
+            if not entry.name.endswith(self.SUFFIX):
+                if entry.name.endswith(".tmp") and self._mtime(entry) < now - self.ORPHAN_AGE:
+                    self._remove(entry.path)
+                continue
+
+            try:
+                with open(entry.path, "rb") as f:
+                    expires_at = self._read_expiry(f)
+            except FileNotFoundError:
+                continue
+            except Exception:
+                expires_at = 0
+
+            if expires_at is not None and expires_at < now:
+                self._remove(entry.path)
+            else:
+                kept.append((self._mtime(entry), entry.path))
+
+        # Still above the limit: drop the least recently written entries
+        kept.sort()
+        for _, path in kept[:max(0, len(kept) - self.max_entries)]:
+            self._remove(path)
+
+    # -----------------------------------------------------------
+    # Helpers
+    # -----------------------------------------------------------
+    def _path(self, key):
+        return os.path.join(self.location, f"{key}{self.SUFFIX}")
+
+    @staticmethod
+    def _read_expiry(f):
+        expires_at = pickle.load(f)
+
+        if expires_at is not None and not isinstance(expires_at, float):
+            raise ValueError("Not a result cache entry.")
+
+        return expires_at
+
+    @staticmethod
+    def _mtime(entry):
+        try:
+            return entry.stat().st_mtime
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class DjangoResultCache(BaseResultCache):
+    """Delegates to one of the caches configured in settings.CACHES."""
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+
+    def get(self, key):
+        return caches[self.alias].get(key)
+
+    def set(self, key, value, ttl):
+        caches[self.alias].set(key, value, ttl or None)
+
+
+def make_cache_key(geometry, layer_versions):
+    """
+    Content-addressed key: hash of the normalized target geometry (EWKB) plus
+    the data version of every layer, so any re-import invalidates old entries.
+    """
+    digest = hashlib.sha256()
+    digest.update(bytes(geometry.normalize(clone=True).ewkb))
+
+    for label, version in sorted(layer_versions.items()):
+        digest.update(f"|{label}:{version}".encode("utf-8"))
+
+    return f"analysis:{digest.hexdigest()}"
+
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Return the process-wide cache backend configured in settings.ANALYSIS_RESULT_CACHE."""
+    global _result_cache
+
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = _build_result_cache()
+
+    return _result_cache
+
+
+def _build_result_cache():
+    options = getattr(settings, "ANALYSIS_RESULT_CACHE", {})
+    backend = options.get("BACKEND", "memory")
+
+    if backend == "memory":
+        return LocalMemoryResultCache(max_entries=options.get("MAX_ENTRIES", 256))
+
+    if backend == "filesystem":
+        location = os.path.realpath(options["LOCATION"])
+        media_root = os.path.realpath(settings.MEDIA_ROOT)
+
+        # Entries are pickles: a file planted through an upload would be executed on load
+        if os.path.commonpath([location, media_root]) == media_root:
+            raise ImproperlyConfigured("ANALYSIS_RESULT_CACHE LOCATION must not be inside MEDIA_ROOT.")
+
+        return FileSystemResultCache(location, max_entries=options.get("MAX_ENTRIES", 256))
+
+    if backend == "django":
+        return DjangoResultCache(options.get("ALIAS", "default"))
+
+    if backend == "none":
+        return NullResultCache()
+
+    raise ValueError(f"Unknown analysis result cache backend: {backend}")
@@ -1,77 +1,102 @@
-import json
-import time
+from django.conf import settings
+from analysis.services.analyze_coordinates.result_cache import get_result_cache, make_cache_key
+from analysis.services.analyze_coordinates.overlap.car_overlap_service import CarOverlapService
 from analysis.services.analyze_coordinates.overlap.final_result_builder import FinalResultBuilder
 from analysis.services.analyze_coordinates.overlap.formatter_register import FormatterRegister
 from analysis.services.analyze_coordinates.overlap.geometry_target import GeometryTarget
 from analysis.services.analyze_coordinates.overlap.pipeline import OverlapPipeline
+from control_panel.services.layer_statistics_service import LayerStatisticsService
+from kernel.service.instrumentation.instrumentation import get_instrumentation
 
 
 class SearchAll:
     """
     High-level service responsible for:
     - Preparing the geometry target (CAR or external polygon)
-    - Executing the overlap pipeline
+    - Reading the precomputed overlaps of a CAR (CarOverlapService) and
+      executing the overlap pipeline for the remaining layers
     - Building the final structured response for the UI
-    - Tracking performance (timing each step)
+    - Caching results by target geometry and layer data versions
+    - Reporting spans for each step through the instrumentation API
     """
 
-    def __init__(self):
-        self.pipeline = OverlapPipeline()
+    def __init__(self, result_cache=None, instrumentation=None):
+        self.instrumentation = instrumentation or get_instrumentation()
+        self.pipeline = OverlapPipeline(instrumentation=self.instrumentation)
         self.builder = FinalResultBuilder()
         self.formatters = FormatterRegister()
+        self.result_cache = result_cache or get_result_cache()
+        self.car_overlaps = CarOverlapService()
+        self.cache_ttl = getattr(settings, "ANALYSIS_RESULT_CACHE", {}).get("TTL", 3600)
 
     def execute(self, geometry_or_car):
-        performance = {}
-
         # ------------------------------------------------------
         # Detect input type and create a GeometryTarget
         # ------------------------------------------------------
-        t0 = time.perf_counter()
+        input_type = "CAR" if hasattr(geometry_or_car, "geometry_new") else "ExternalGeometry"
 
-        if hasattr(geometry_or_car, "geometry_new"):
-            target = GeometryTarget(geometry_or_car.geometry_new)
-            target.car = geometry_or_car
-            input_type = "CAR"
-        else:
-            target = GeometryTarget(geometry_or_car)
-            target.car = None
-            input_type = "ExternalGeometry"
+        with self.instrumentation.span("analysis.target_creation", input_type=input_type):
+            if input_type == "CAR":
+                target = GeometryTarget(geometry_or_car.geometry_new)
+                target.car = geometry_or_car
+            else:
+                target = GeometryTarget(geometry_or_car)
+                target.car = None
 
-        performance["input_type"] = input_type
-        performance["time_target_creation"] = time.perf_counter() - t0
+        layers = list(self.formatters.formatters.keys())
 
         # ------------------------------------------------------
-        # Run overlap pipeline
+        # Result cache (target geometry + layer data versions)
         # ------------------------------------------------------
-        t1 = time.perf_counter()
+        with self.instrumentation.span("analysis.cache_lookup"):
+            layer_versions = {
+                layer._meta.label: version
+                for layer, version in LayerStatisticsService().versions(layers).items()
+            }
+            cache_key = make_cache_key(target.geometry, layer_versions)
+            cached_output = self.result_cache.get(cache_key)
 
-        layers = list(self.formatters.formatters.keys())
-
-        pipeline_result= self.pipeline.run(
-            target=target,
-            layers=layers,
-            formatters=self.formatters.formatters,
-        )
+        if cached_output is not None:
+            self.instrumentation.count("analysis.cache_hits", input_type=input_type)
+            return cached_output
 
-        performance["time_pipeline_total"] = time.perf_counter() - t1
+        self.instrumentation.count("analysis.cache_misses", input_type=input_type)
 
         # ------------------------------------------------------
-        # Build final structured output (UI format)
+        # Precomputed overlaps (CAR already in the database)
         # ------------------------------------------------------
-        t2 = time.perf_counter()
+        pipeline_result = {}
 
-        final_output = self.builder.build(
-            target=target,
-            results_by_layer=pipeline_result,
-            layers=layers,
-        )
+        if target.car is not None:
+            with self.instrumentation.span("analysis.precomputed_lookup"):
+                precomputed = self.car_overlaps.results(target, self.formatters.formatters)
 
-        performance["time_builder"] = time.perf_counter() - t2
+            if precomputed is not None:
+                self.instrumentation.count("analysis.precomputed_hits", input_type=input_type)
+                pipeline_result.update(precomputed)
 
         # ------------------------------------------------------
-        # Save output for debugging
+        # Run overlap pipeline
+        # ------------------------------------------------------
+        remaining = [layer for layer in layers if layer.__name__ not in pipeline_result]
+
+        if remaining:
+            pipeline_result.update(self.pipeline.run(
+                target=target,
+                layers=remaining,
+                formatters=self.formatters.formatters,
+            ))
+
+        # ------------------------------------------------------
+        # Build final structured output (UI format)
         # ------------------------------------------------------
-        with open("performance_log.json", "w") as f:
-            json.dump(performance, f, indent=2)
+        with self.instrumentation.span("analysis.build"):
+            final_output = self.builder.build(
+                target=target,
+                results_by_layer=pipeline_result,
+                layers=layers,
+            )
+
+        self.result_cache.set(cache_key, final_output, self.cache_ttl)
 
         return final_output
@@ -0,0 +1,54 @@
+from analysis.services.analyze_coordinates.overlap.final_result_builder import FinalResultBuilder
+from analysis.services.analyze_coordinates.overlap.formatter_register import FormatterRegister
+from analysis.services.analyze_coordinates.overlap.geometry_target import GeometryTarget
+from analysis.services.analyze_coordinates.overlap.pipeline import OverlapPipeline
+from kernel.service.instrumentation.instrumentation import get_instrumentation
+
+
+class StreamingSearch:
+    """
+    Streaming counterpart of SearchAll: yields the analysis as a sequence of
+    events instead of one final dict, so each layer block can be sent as
+    soon as the pipeline finishes it.
+
+    Events:
+    - "inicio": target area and the bases that will be analysed
+    - "base": one per layer, same block as "resultados_por_base", in
+      completion order
+    - "fim": totals and the layer summary
+    """
+
+    def __init__(self, instrumentation=None):
+        self.instrumentation = instrumentation or get_instrumentation()
+        self.pipeline = OverlapPipeline(instrumentation=self.instrumentation)
+        self.builder = FinalResultBuilder()
+        self.formatters = FormatterRegister()
+
+    def events(self, geometry):
+        with self.instrumentation.span("analysis.target_creation", input_type="Stream"):
+            target = GeometryTarget(geometry)
+
+        formatters = self.formatters.formatters
+        layers = list(formatters.keys())
+        layers_by_name = {layer.__name__: layer for layer in layers}
+
+        yield {
+            "evento": "inicio",
+            "tamanho_area": target.area_ha,
+            "bases": [self.builder._base_name(layer) for layer in layers],
+        }
+
+        total = 0
+
+        for layer_name, records in self.pipeline.iter_run(target, layers, formatters):
+            total += len(records)
+            yield {
+                "evento": "base",
+                **self.builder.layer_block(layers_by_name[layer_name], records),
+            }
+
+        yield {
+            "evento": "fim",
+            "total_areas_com_sobreposicao": total,
+            "resumo_bases": self.builder.summary_counts(layers),
+        }
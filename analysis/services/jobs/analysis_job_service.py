@@ -0,0 +1,122 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from analysis.models import AnalysisJob
+from analysis.services.analyze_coordinates.search_all import SearchAll
+from analysis.services.analyze_coordinates.search_for_car import SearchForCar
+from car_system.utils import get_sicar_record
+from kernel.utils import locate_city_state
+
+
+class AnalysisJobService:
+    """
+    DB-backed queue of overlap analyses.
+
+    - enqueue(): creates a pending job (uploaded geometry or CAR number)
+    - claim_next(): takes the oldest pending job with
+      SELECT ... FOR UPDATE SKIP LOCKED, so several workers never pick the
+      same job and the queue is served in arrival order
+    - run(): executes the analysis and stores the result or the error
+    - requeue_stale(): puts back jobs whose worker died mid-run
+    """
+
+    def __init__(self, timeout=None, max_attempts=None):
+        self.timeout = timeout or getattr(settings, "ANALYSIS_JOB_TIMEOUT", 1800)
+        self.max_attempts = max_attempts or getattr(settings, "ANALYSIS_JOB_MAX_ATTEMPTS", 3)
+
+    def enqueue(self, geometry=None, car_number=None, user=None, api_client=''):
+        if geometry is None and not car_number:
+            raise ValueError("A job needs a geometry or a CAR number.")
+
+        return AnalysisJob.objects.create(
+            geometry=geometry,
+            car_number=car_number or None,
+            created_by=user if user is not None and user.is_authenticated else None,
+            api_client=api_client,
+        )
+
+    @staticmethod
+    def owned_by(user=None, api_client=''):
+        """Jobs visible to a requester: those created with its API token, or by the logged-in user."""
+        if api_client:
+            return AnalysisJob.objects.filter(api_client=api_client)
+
+        if user is not None and user.is_authenticated:
+            return AnalysisJob.objects.filter(created_by=user)
+
+        return AnalysisJob.objects.none()
+
+    def claim_next(self, worker_name):
+        with transaction.atomic():
+            job = (
+                AnalysisJob.objects
+                .select_for_update(skip_locked=True)
+                .filter(status=AnalysisJob.Status.PENDING)
+                .order_by("created_at")
+                .first()
+            )
+
+            if job is None:
+                return None
+
+            job.status = AnalysisJob.Status.RUNNING
+            job.worker = worker_name
+            job.started_at = timezone.now()
+            job.attempts += 1
+            job.save(update_fields=["status", "worker", "started_at", "attempts"])
+
+        return job
+
+    def run(self, job):
+        try:
+            if job.geometry is not None:
+                job.result = SearchAll().execute(job.geometry)
+                job.municipality, job.state = self._locate(job.geometry)
+            else:
+                job.result = SearchForCar().execute(job.car_number)
+                record = (
+                    get_sicar_record(car_number=job.car_number)
+                    .only("municipality", "state")
+                    .first()
+                )
+                if record:
+                    job.municipality, job.state = record.municipality, record.state
+
+            job.status = AnalysisJob.Status.DONE
+            job.error = ""
+        except Exception as e:
+            job.status = AnalysisJob.Status.FAILED
+            job.error = str(e)
+
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "result", "municipality", "state", "error", "finished_at"])
+
+        return job
+
+    @staticmethod
+    def _locate(geometry):
+        """Municipality and state are informative: a geocoding failure must not fail the analysis."""
+        try:
+            return locate_city_state(geometry)
+        except Exception:
+            return None, None
+
+    def requeue_stale(self):
+        """Jobs running for longer than the timeout go back to the queue (or fail after max attempts)."""
+        deadline = timezone.now() - timedelta(seconds=self.timeout)
+        stale = AnalysisJob.objects.filter(status=AnalysisJob.Status.RUNNING, started_at__lt=deadline)
+
+        failed = stale.filter(attempts__gte=self.max_attempts).update(
+            status=AnalysisJob.Status.FAILED,
+            error="Tempo limite excedido.",
+            finished_at=timezone.now(),
+        )
+        requeued = stale.filter(attempts__lt=self.max_attempts).update(
+            status=AnalysisJob.Status.PENDING,
+            worker="",
+        )
+
+        return requeued, failed
@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+
+from analysis.services.analyze_coordinates.overlap.car_overlap_service import CarOverlapService
+from car_system.models import SicarRecord
+
+
+def record_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    pk = instance.pk
+    # After commit: the sync reads the saved geometry from other statements
+    transaction.on_commit(lambda: CarOverlapService().sync_record(sender, pk))
+
+
+def connect_car_overlaps():
+    """Keep the precomputed CAR overlaps in sync with single-row saves (admin) of the CARs and layers."""
+    for model in (SicarRecord, *CarOverlapService.default_layers()):
+        post_save.connect(record_saved, sender=model, dispatch_uid=f"car_overlaps_{model._meta.label}")
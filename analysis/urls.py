@@ -5,4 +5,11 @@ urlpatterns = [
     path('', views.AnswerspageView.as_view(), name='homepage'),
     path('upload/', views.UploadZipCarView.as_view(), name='upload_zip_car'),
     path('termos/', views.termos, name='termos_de_uso'),
+    path('debug/instrumentacao/', views.instrumentation_debug, name='instrumentation_debug'),
+    path('metrics/', views.metrics, name='metrics'),
+    path('api/analyses/', views.stream_analysis, name='stream_analysis'),
+    path('api/batch/', views.batch_analysis, name='batch_analysis'),
+    path('api/jobs/', views.create_analysis_job, name='analysis_job_create'),
+    path('api/jobs/<uuid:job_id>/', views.analysis_job_status, name='analysis_job_status'),
+    path('api/jobs/<uuid:job_id>/result/', views.analysis_job_result, name='analysis_job_result'),
 ]
\ No newline at end of file
@@ -1,14 +1,32 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
 from django.shortcuts import render
+from analysis.services.analyze_coordinates.batch_search_all import BatchSearchAll
 from analysis.services.analyze_coordinates.search_all import SearchAll
+from analysis.services.analyze_coordinates.streaming_search import StreamingSearch
 from analysis.services.analyze_coordinates.search_for_car import SearchForCar
 from analysis.services.view_services.zip_upload_service import ZipUploadService
 from car_system.utils import get_sicar_record
 import zipfile
-from kernel.utils import extract_geometry, locate_city_state
+from kernel.utils import extract_geometries, extract_geometry, locate_city_state
 
 
 from django.views import View
 from django.shortcuts import render
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_GET, require_POST
+from analysis.decorators import api_auth_required
+from analysis.models import AnalysisJob
+from analysis.services.jobs.analysis_job_service import AnalysisJobService
+from kernel.service import fast_json
+from kernel.service.instrumentation.exporters import PrometheusExporter, RingBufferExporter
+from kernel.service.instrumentation.instrumentation import get_instrumentation
 
 class AnswerspageView(View):
     template_name = 'analysis/index.html'
@@ -59,13 +77,18 @@ class AnswerspageView(View):
         })
 
 class UploadZipCarView(View):
+    """
+    View assíncrona: a análise de sobreposição e a localização de
+    município/UF rodam ao mesmo tempo, em threads separadas, então a
+    latência é a da etapa mais lenta e não a soma das duas.
+    """
     template_upload = 'analysis/upload.html'
     template_index = 'analysis/index.html'
-    
-    def get(self, request):
-        return render(request, self.template_upload)
 
-    def post(self, request):
+    async def get(self, request):
+        return await arender(request, self.template_upload)
+
+    async def post(self, request):
         zip_file = request.FILES.get('zip_file')
         car_input = request.POST.get('car_input', '').strip()
 
@@ -75,40 +98,40 @@ class UploadZipCarView(View):
         # 1) Caso só CAR informado (sem ZIP)
         # --------------------------------------
         if not zip_file and car_input:
-            return self._handle_only_car(request, car_input, context)
+            return await sync_to_async(self._handle_only_car)(request, car_input, context)
 
         # --------------------------------------
         # 2) Nenhum arquivo enviado
         # --------------------------------------
         if not zip_file:
             context['erro'] = 'Por favor, envie um arquivo ZIP ou informe o número do CAR.'
-            return render(request, self.template_upload, context)
+            return await arender(request, self.template_upload, context)
 
         # --------------------------------------
         # 3) Caso ZIP enviado
         # --------------------------------------
         try:
-            zip_dataframe = ZipUploadService().extract_geodataframe(zip_file)
+            zip_dataframe = await in_thread(ZipUploadService().extract_geodataframe)(zip_file)
 
             if zip_dataframe is None or zip_dataframe.empty:
                 context['erro'] = 'O arquivo ZIP não contém dados geográficos válidos.'
-                return render(request, self.template_upload, context)
+                return await arender(request, self.template_upload, context)
 
             coordenadas_input = extract_geometry(zip_dataframe)
 
             if not coordenadas_input or not str(coordenadas_input).strip():
                 context['erro'] = 'Não foi possível extrair coordenadas do shapefile enviado.'
-                return render(request, self.template_upload, context)
+                return await arender(request, self.template_upload, context)
 
-            return self._process_coordinates(request, coordenadas_input, car_input)
+            return await self._process_coordinates(request, coordenadas_input, car_input)
 
         except zipfile.BadZipFile:
             context['erro'] = 'Arquivo ZIP inválido ou corrompido.'
-            return render(request, self.template_upload, context)
+            return await arender(request, self.template_upload, context)
 
         except Exception as e:
             context['erro'] = f'Erro ao processar o arquivo: {str(e)}'
-            return render(request, self.template_upload, context)
+            return await arender(request, self.template_upload, context)
 
     # =====================================================================
     # Métodos auxiliares
@@ -120,11 +143,18 @@ class UploadZipCarView(View):
             resultado = SearchForCar().execute(car_input)
 
             municipality, state = None, None
-            wkt_car = get_sicar_record(car_number=car_input)
+            record = (
+                get_sicar_record(car_number=car_input)
+                .only('municipality', 'state', 'geometry_new')
+                .first()
+            )
+
+            if record:
+                municipality, state = record.municipality, record.state
 
-            if wkt_car.exists():
-                geometry = wkt_car.first().geometry
-                municipality, state = locate_city_state(geometry)
+                # CARs imported before the boundary layer: geocode on demand
+                if not municipality and record.geometry_new:
+                    municipality, state = locate_city_state(record.geometry_new)
 
             return render(request, self.template_index, {
                 'resultado': resultado,
@@ -138,18 +168,15 @@ class UploadZipCarView(View):
             context['erro'] = f'Erro ao analisar pelo CAR: {str(e)}'
             return render(request, self.template_upload, context)
 
-    def _process_coordinates(self, request, coordenadas_input, car_input):
-        """Processa os dados extraídos do shapefile."""
+    async def _process_coordinates(self, request, coordenadas_input, car_input):
+        """Processa os dados extraídos do shapefile (análise e localização em paralelo)."""
         try:
-            resultado = SearchAll().execute(coordenadas_input)
+            resultado, (municipio, uf) = await asyncio.gather(
+                in_thread(SearchAll().execute)(coordenadas_input),
+                in_thread(self._locate)(coordenadas_input),
+            )
 
-            municipio, uf = None, None
-            try:
-                municipio, uf = locate_city_state(coordenadas_input)
-            except Exception:
-                pass
-
-            return render(request, self.template_index, {
+            return await arender(request, self.template_index, {
                 'resultado': resultado,
                 'coordenadas_recebidas': coordenadas_input,
                 'car_input': car_input,
@@ -159,12 +186,268 @@ class UploadZipCarView(View):
             })
 
         except Exception as e:
-            return render(request, self.template_index, {
+            return await arender(request, self.template_index, {
                 'erro': f'Erro ao processar coordenadas: {str(e)}',
                 'coordenadas_recebidas': coordenadas_input,
                 'car_input': car_input,
                 'sucesso': False
             })
 
+    @staticmethod
+    def _locate(coordenadas_input):
+        try:
+            return locate_city_state(coordenadas_input)
+        except Exception:
+            return None, None
+
+
+def arender(request, template_name, context=None):
+    """render() for async views (templates may hit the database, e.g. request.user)."""
+    return sync_to_async(render)(request, template_name, context)
+
+
+def in_thread(func):
+    """
+    Run a blocking function in its own worker thread (not the shared
+    thread-sensitive one), so several can run concurrently. The thread's
+    database connection is closed afterwards.
+    """
+    def run(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            connection.close()
+
+    return sync_to_async(run, thread_sensitive=False)
+
+
 def termos(request):
     return render(request, 'analysis/termos_de_uso.html')
+
+
+@staff_member_required
+def instrumentation_debug(request):
+    """Últimos spans/contadores registrados (exportador "ring_buffer")."""
+    exporter = get_instrumentation().get_exporter(RingBufferExporter)
+
+    if exporter is None:
+        raise Http404("Exportador ring_buffer não está habilitado.")
+
+    return JsonResponse({'registros': exporter.snapshot()})
+
+
+def metrics(request):
+    """Métricas agregadas no formato texto do Prometheus (exportador "prometheus")."""
+    exporter = get_instrumentation().get_exporter(PrometheusExporter)
+
+    if exporter is None:
+        raise Http404("Exportador prometheus não está habilitado.")
+
+    return HttpResponse(exporter.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@api_auth_required
+@require_POST
+def batch_analysis(request):
+    """
+    Analisa todas as feições (POLYGON/MULTIPOLYGON) do ZIP enviado em uma
+    única passada e devolve um resultado por feição. `id_column` (opcional)
+    indica a coluna do shapefile usada como identificador de cada feição.
+    """
+    zip_file = request.FILES.get('zip_file')
+    id_column = request.POST.get('id_column', '').strip()
+
+    if not zip_file:
+        return JsonResponse({'erro': 'Envie um arquivo ZIP.'}, status=400)
+
+    zip_dataframe = ZipUploadService().extract_geodataframe(zip_file)
+
+    if zip_dataframe is None or zip_dataframe.empty:
+        return JsonResponse({'erro': 'O arquivo ZIP não contém dados geográficos válidos.'}, status=400)
+
+    if id_column and id_column not in zip_dataframe.columns:
+        return JsonResponse({'erro': f'Coluna {id_column} não encontrada no shapefile.'}, status=400)
+
+    features = extract_geometries(zip_dataframe)
+
+    if not features:
+        return JsonResponse({'erro': 'Nenhuma geometria válida encontrada no arquivo.'}, status=400)
+
+    max_features = getattr(settings, 'ANALYSIS_BATCH_MAX_FEATURES', 1000)
+    if len(features) > max_features:
+        return JsonResponse({'erro': f'O arquivo tem {len(features)} feições; o limite é {max_features}.'}, status=400)
+
+    resultados = BatchSearchAll().execute([geometry for _, geometry in features])
+
+    return JsonResponse({
+        'quantidade_feicoes': len(features),
+        'feicoes': [
+            {
+                'feicao': int(index),
+                'identificador': _plain_value(zip_dataframe.at[index, id_column]) if id_column else None,
+                'resultado': resultado,
+            }
+            for (index, _), resultado in zip(features, resultados)
+        ],
+    })
+
+
+@api_auth_required
+@require_POST
+def stream_analysis(request):
+    """
+    Análise com resultado em streaming: cada base é enviada assim que o
+    pipeline termina de processá-la (eventos "inicio", "base" e "fim").
+
+    Formato NDJSON por padrão; Server-Sent Events com `formato=sse` ou
+    `Accept: text/event-stream`.
+    """
+    zip_file = request.FILES.get('zip_file')
+    car_input = request.POST.get('car_input', '').strip()
+
+    if zip_file:
+        zip_dataframe = ZipUploadService().extract_geodataframe(zip_file)
+
+        if zip_dataframe is None or zip_dataframe.empty:
+            return JsonResponse({'erro': 'O arquivo ZIP não contém dados geográficos válidos.'}, status=400)
+
+        geometry = extract_geometry(zip_dataframe)
+
+        if geometry is None:
+            return JsonResponse({'erro': 'Não foi possível extrair coordenadas do shapefile enviado.'}, status=400)
+
+    elif car_input:
+        record = get_sicar_record(car_number=car_input).only('geometry_new').first()
+
+        if record is None or not record.geometry_new:
+            return JsonResponse({'erro': 'CAR não encontrado.'}, status=404)
+
+        geometry = record.geometry_new
+
+    else:
+        return JsonResponse({'erro': 'Envie um arquivo ZIP ou informe o número do CAR.'}, status=400)
+
+    use_sse = (
+        request.POST.get('formato', request.GET.get('formato')) == 'sse'
+        or 'text/event-stream' in request.headers.get('Accept', '')
+    )
+
+    if use_sse:
+        response = StreamingHttpResponse(_sse_lines(geometry), content_type='text/event-stream')
+    else:
+        response = StreamingHttpResponse(_ndjson_lines(geometry), content_type='application/x-ndjson')
+
+    # Proxies (nginx) must not buffer the stream
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _analysis_events(geometry):
+    try:
+        yield from StreamingSearch().events(geometry)
+    except Exception as e:
+        yield {'evento': 'erro', 'erro': f'Erro ao processar coordenadas: {str(e)}'}
+
+
+def _ndjson_lines(geometry):
+    for event in _analysis_events(geometry):
+        yield fast_json.dumps(event) + b'\n'
+
+
+def _sse_lines(geometry):
+    for event in _analysis_events(geometry):
+        yield b'event: ' + event['evento'].encode() + b'\ndata: ' + fast_json.dumps(event) + b'\n\n'
+
+
+def _plain_value(value):
+    """numpy scalar → Python value, so JsonResponse can serialize it."""
+    return value.item() if hasattr(value, 'item') else value
+
+
+# =====================================================================
+# Jobs de análise em segundo plano (run_analysis_worker)
+# =====================================================================
+
+@api_auth_required
+@require_POST
+def create_analysis_job(request):
+    """Enfileira uma análise (ZIP com shapefile ou número do CAR) e responde 202 com o id do job."""
+    zip_file = request.FILES.get('zip_file')
+    car_input = request.POST.get('car_input', '').strip()
+
+    geometry = None
+
+    if zip_file:
+        zip_dataframe = ZipUploadService().extract_geodataframe(zip_file)
+
+        if zip_dataframe is None or zip_dataframe.empty:
+            return JsonResponse({'erro': 'O arquivo ZIP não contém dados geográficos válidos.'}, status=400)
+
+        geometry = extract_geometry(zip_dataframe)
+
+        if geometry is None:
+            return JsonResponse({'erro': 'Não foi possível extrair coordenadas do shapefile enviado.'}, status=400)
+
+    elif not car_input:
+        return JsonResponse({'erro': 'Envie um arquivo ZIP ou informe o número do CAR.'}, status=400)
+
+    job = AnalysisJobService().enqueue(
+        geometry=geometry,
+        car_number=car_input if geometry is None else None,
+        user=request.user,
+        api_client=request.api_client,
+    )
+
+    return JsonResponse(_job_payload(job), status=202)
+
+
+@api_auth_required
+@require_GET
+def analysis_job_status(request, job_id):
+    job = get_object_or_404(_requester_jobs(request).defer('geometry', 'result'), pk=job_id)
+    return JsonResponse(_job_payload(job))
+
+
+@api_auth_required
+@require_GET
+def analysis_job_result(request, job_id):
+    job = get_object_or_404(_requester_jobs(request).defer('geometry'), pk=job_id)
+
+    if job.status != AnalysisJob.Status.DONE:
+        return JsonResponse(_job_payload(job), status=409)
+
+    return JsonResponse({
+        'id': str(job.id),
+        'municipio': job.municipality,
+        'uf': job.state,
+        'resultado': job.result,
+    })
+
+
+def _requester_jobs(request):
+    """Jobs of someone else answer 404, as if they did not exist."""
+    return AnalysisJobService.owned_by(request.user, request.api_client)
+
+
+def _job_payload(job):
+    payload = {
+        'id': str(job.id),
+        'status': job.status,
+        'situacao': job.get_status_display(),
+        'tentativas': job.attempts,
+        'criado_em': job.created_at,
+        'iniciado_em': job.started_at,
+        'finalizado_em': job.finished_at,
+        'erro': job.error or None,
+        'url_status': reverse('analysis_job_status', args=[job.id]),
+        'url_resultado': reverse('analysis_job_result', args=[job.id]),
+    }
+
+    if job.status == AnalysisJob.Status.PENDING:
+        payload['posicao_fila'] = AnalysisJob.objects.filter(
+            status=AnalysisJob.Status.PENDING,
+            created_at__lt=job.created_at,
+        ).count() + 1
+
+    return payload
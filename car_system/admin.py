@@ -4,13 +4,13 @@ from leaflet.admin import LeafletGeoAdmin
 
 @admin.register(SicarRecord)
 class SicarRecordAdmin(LeafletGeoAdmin):
-    list_display = ('id', 'car_number', 'status', 'area_ha')
+    list_display = ('id', 'car_number', 'status', 'municipality', 'state', 'area_ha')
     search_fields = ('car_number', 'status')
-    list_filter = ('status', 'last_update')
+    list_filter = ('status', 'state', 'last_update')
     
     fieldsets = (
         (None, {
-            'fields': ('car_number', 'status', 'last_update', 'geometry', 'created_by', 'source')
+            'fields': ('car_number', 'status', 'last_update', 'municipality', 'state', 'geometry', 'created_by', 'source')
         }),
         (None, {
             'fields': (
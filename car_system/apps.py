@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class CarSystemConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'car_system'
+
+    def ready(self):
+        from control_panel.signals import connect_layer_statistics
+        from car_system.models import SicarRecord
+
+        connect_layer_statistics(SicarRecord)
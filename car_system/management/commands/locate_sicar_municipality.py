@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from car_system.services.location.sicar_location_service import SicarLocationService
+
+
+class Command(BaseCommand):
+    help = (
+        "Preenche município/UF dos registros SICAR com um join espacial contra a "
+        "malha municipal do IBGE (import_municipality_boundary). Processa em lotes "
+        "por id; pode ser interrompido e retomado."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Quantidade de registros atualizados por lote."
+        )
+        parser.add_argument(
+            "--start-id",
+            type=int,
+            default=0,
+            help="Retoma a partir deste id (exclusivo)."
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recalcula todos os registros, não só os que ainda não têm município."
+        )
+
+    def handle(self, *args, **options):
+        service = SicarLocationService(batch_size=options["batch_size"])
+
+        if not service.has_boundaries():
+            raise CommandError("Nenhum limite municipal importado. Execute import_municipality_boundary.")
+
+        start = time.perf_counter()
+
+        def report(total, last_id):
+            self.stdout.write(
+                f"✔ {total} registros localizados (último id: {last_id}, "
+                f"{total / (time.perf_counter() - start):.0f} registros/s)"
+            )
+
+        total = service.locate(
+            start_id=options["start_id"],
+            only_missing=not options["all"],
+            progress=report,
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"Concluído: {total} registros atualizados."))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('car_system', '0006_alter_sicarrecord_geometry_new'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sicarrecord',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_column='impressao_digital', max_length=16, null=True, verbose_name='Impressão Digital'),
+        ),
+    ]
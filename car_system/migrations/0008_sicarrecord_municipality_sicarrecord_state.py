@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('car_system', '0007_sicarrecord_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sicarrecord',
+            name='municipality',
+            field=models.CharField(blank=True, db_column='municipio', max_length=100, null=True, verbose_name='Município'),
+        ),
+        migrations.AddField(
+            model_name='sicarrecord',
+            name='state',
+            field=models.CharField(blank=True, db_column='uf', max_length=2, null=True, verbose_name='UF'),
+        ),
+    ]
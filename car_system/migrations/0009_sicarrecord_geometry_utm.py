@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:18
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('car_system', '0008_sicarrecord_municipality_sicarrecord_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sicarrecord',
+            name='geometry_utm',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, db_column='geometria_utm', null=True, srid=31982, verbose_name='Geometria UTM'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:33
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('car_system', '0009_sicarrecord_geometry_utm'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='sicarrecord',
+            name='geometry_utm',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, db_column='geometria_utm', null=True, spatial_index=False, srid=31982, verbose_name='Geometria UTM'),
+        ),
+    ]
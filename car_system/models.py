@@ -18,6 +18,22 @@ class SicarRecord(GeoBaseModel):
     
     status = models.CharField(max_length=50)
 
+    municipality = models.CharField(
+        max_length=100,
+        verbose_name="Município",
+        db_column='municipio',
+        null=True,
+        blank=True
+    )
+
+    state = models.CharField(
+        max_length=2,
+        verbose_name="UF",
+        db_column='uf',
+        null=True,
+        blank=True
+    )
+
     class Meta:
         db_table = 'tb_registro_sicar'
         verbose_name = "Registro do SICAR"
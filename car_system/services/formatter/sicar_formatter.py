@@ -1,6 +1,8 @@
 from kernel.service.abstract.base_formatter import BaseFormatter
 
 class SicarFormatter(BaseFormatter):
+    fields = ("car_number", "status")
+
     def format(self, model_obj, intersec):
         return {
             "area": intersec["intersection_area_ha"],
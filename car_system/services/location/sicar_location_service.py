@@ -0,0 +1,97 @@
+from django.db import connection, transaction
+
+from car_system.models import SicarRecord
+from environmental_layers.models import MunicipalityBoundary
+
+
+class SicarLocationService:
+    """
+    Fills SicarRecord.municipality / state with a set-based spatial join
+    against the IBGE municipality boundary layer (point on surface of each
+    CAR, GiST index on the boundaries).
+
+    Works in id batches; each batch is committed separately. Every row of a
+    batch is written, so CARs outside the boundary layer get NULL and the
+    scan still moves forward.
+    """
+
+    def __init__(self, batch_size=5000):
+        self.batch_size = batch_size
+
+    def has_boundaries(self):
+        return MunicipalityBoundary.objects.exists()
+
+    def locate(self, start_id=0, only_missing=True, updated_since=None, progress=None) -> int:
+        """
+        Locate CARs with id > start_id. By default only rows without a
+        municipality; updated_since also includes rows written since then
+        (e.g. geometries changed by an import). Returns the number of rows written.
+        """
+        conditions = []
+        params = []
+
+        if only_missing:
+            conditions.append(f"t.{self._column(SicarRecord, 'municipality')} IS NULL")
+        if updated_since is not None:
+            conditions.append(f"t.{self._column(SicarRecord, 'updated_at')} >= %s")
+            params.append(updated_since)
+
+        where = f"AND ({' OR '.join(conditions)})" if conditions else ""
+
+        last_id = start_id
+        total = 0
+
+        while True:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(self.batch_sql(where), [last_id, *params, self.batch_size])
+                ids = [row[0] for row in cursor.fetchall()]
+
+            if not ids:
+                return total
+
+            last_id = max(ids)
+            total += len(ids)
+
+            if progress:
+                progress(total, last_id)
+
+    @classmethod
+    def batch_sql(cls, where):
+        qn = connection.ops.quote_name
+        sicar = qn(SicarRecord._meta.db_table)
+        boundaries = qn(MunicipalityBoundary._meta.db_table)
+
+        car_geom = cls._column(SicarRecord, "geometry_new")
+        municipality = cls._column(SicarRecord, "municipality")
+        state = cls._column(SicarRecord, "state")
+        boundary_geom = cls._column(MunicipalityBoundary, "geometry_new")
+        boundary_name = cls._column(MunicipalityBoundary, "municipality_name")
+        boundary_state = cls._column(MunicipalityBoundary, "state_acronym")
+
+        return f"""
+            WITH batch AS (
+                SELECT t.id, ST_PointOnSurface(t.{car_geom}) AS point
+                FROM {sicar} t
+                WHERE t.id > %s
+                  AND t.{car_geom} IS NOT NULL
+                  {where}
+                ORDER BY t.id
+                LIMIT %s
+            )
+            UPDATE {sicar} t
+            SET {municipality} = m.name,
+                {state} = m.state
+            FROM batch b
+            LEFT JOIN LATERAL (
+                SELECT l.{boundary_name} AS name, l.{boundary_state} AS state
+                FROM {boundaries} l
+                WHERE ST_Intersects(l.{boundary_geom}, b.point)
+                LIMIT 1
+            ) m ON TRUE
+            WHERE t.id = b.id
+            RETURNING t.id
+        """
+
+    @staticmethod
+    def _column(model, field_name):
+        return connection.ops.quote_name(model._meta.get_field(field_name).column)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import FileManagement
+from .models import FileManagement, LayerStatistics
 
 class FileManagementAdmin(admin.ModelAdmin):
     list_display = (
@@ -31,5 +31,13 @@ class FileManagementAdmin(admin.ModelAdmin):
         return not FileManagement.objects.exists()
 
 admin.site.register(FileManagement, FileManagementAdmin)
-    
-    
+
+
+class LayerStatisticsAdmin(admin.ModelAdmin):
+    list_display = ('layer', 'row_count', 'data_version', 'refreshed_at')
+    readonly_fields = ('layer', 'row_count', 'data_version', 'refreshed_at')
+
+    def has_add_permission(self, request):
+        return False
+
+admin.site.register(LayerStatistics, LayerStatisticsAdmin)
@@ -0,0 +1,159 @@
+import os
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.models import User
+
+from analysis.services.analyze_coordinates.overlap.car_overlap_service import CarOverlapService
+from control_panel.services.layer_statistics_service import LayerStatisticsService
+from control_panel.utils import get_file_management
+from kernel.models import GeoBaseModel
+from kernel.service.import_engine.layer_import_engine import LayerImportEngine
+from kernel.service.overlay.layer_overlay_service import LayerOverlayService
+from kernel.service.subdivision.layer_subdivision_service import LayerSubdivisionService
+
+
+def get_layer(name):
+    """Modelo de camada a partir de "app_label.Modelo" ou apenas do nome do modelo."""
+    if "." in name:
+        try:
+            model = apps.get_model(name)
+        except (LookupError, ValueError) as e:
+            raise CommandError(f"Camada inválida: {name} ({e})")
+    else:
+        matches = [model for model in apps.get_models() if model.__name__ == name]
+        if not matches:
+            raise CommandError(f"Camada não encontrada: {name}")
+        model = matches[0]
+
+    if not issubclass(model, GeoBaseModel):
+        raise CommandError(f"{name} não é uma camada geográfica (GeoBaseModel).")
+
+    return model
+
+
+def sync_derived_data(model, since, stdout):
+    """
+    Atualiza o que é derivado das geometrias da camada (estatísticas, tabela
+    subdividida, sobreposição planar e sobreposições pré-calculadas dos CARs)
+    para os registros gravados desde `since` (atualizado_em).
+    """
+    LayerStatisticsService().refresh(model)
+
+    pieces = LayerSubdivisionService().sync(model, since=since)
+    if pieces:
+        stdout.write(f"Tabela subdividida atualizada: {pieces} pedaços.")
+
+    faces = LayerOverlayService().sync(model)
+    if faces:
+        stdout.write(f"Sobreposição planar das camadas reconstruída: {faces} faces.")
+
+    cars = CarOverlapService().sync(model, since=since)
+    if cars:
+        stdout.write(f"Sobreposições pré-calculadas atualizadas para {cars} CARs.")
+
+
+class LayerImportCommand(BaseCommand):
+    """
+    Base dos comandos de importação de camadas. Cada comando só declara o
+    `spec` (LayerImportSpec); leitura, formatação, hash e carga em lote ficam
+    com o LayerImportEngine.
+    """
+
+    spec = None
+    default_chunk_size = 10_000
+    default_on_conflict = "nothing"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Número de processos que leem e formatam os blocos (1 = sem pool)."
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=self.default_chunk_size,
+            help="Quantidade de feições lidas e enviadas por bloco."
+        )
+        parser.add_argument(
+            "--on-conflict",
+            choices=["nothing", "update"],
+            default=self.default_on_conflict,
+            help="O que fazer com registros já existentes: manter (nothing) ou atualizar (update)."
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Grava apenas feições novas ou alteradas (comparando a impressão digital de cada feição)."
+        )
+        parser.add_argument(
+            "--delete-missing",
+            action="store_true",
+            help="Remove os registros da camada que não estão mais no arquivo (implica --on-conflict update)."
+        )
+
+    def get_user(self):
+        user = User.objects.first()
+        if not user:
+            raise CommandError("Nenhum usuário encontrado.")
+        return user
+
+    def get_path(self):
+        archive_path = get_file_management()
+        file = getattr(archive_path, self.spec.file_field, None) if archive_path else None
+
+        if not file:
+            raise CommandError(f"Nenhum arquivo de {self.spec.label} foi configurado.")
+
+        return file.path
+
+    # =============================================================
+    # Execução principal
+    # =============================================================
+    def handle(self, *args, **options):
+        self.stdout.write(f"Iniciando carga em lote de {self.spec.label}...")
+
+        user = self.get_user()
+        path = self.get_path()
+
+        self.before_import()
+
+        engine = LayerImportEngine(
+            self.spec,
+            user,
+            workers=options["workers"],
+            chunk_size=options["chunk_size"],
+            on_conflict=options["on_conflict"],
+            incremental=options["incremental"],
+            delete_missing=options["delete_missing"],
+            progress=self.report_progress,
+        )
+        totals = engine.run(path)
+
+        sync_derived_data(self.spec.model, totals["started_at"], self.stdout)
+
+        self.after_import(totals)
+
+        elapsed = totals["elapsed"]
+        self.stdout.write(self.style.SUCCESS(
+            f"Processamento concluído: {totals['read']} linhas em {elapsed:.1f}s "
+            f"({totals['read'] / elapsed if elapsed else 0:.0f} linhas/s), "
+            f"{totals['inserted']} inseridas, {totals['updated']} atualizadas, "
+            f"{totals['unchanged']} sem alteração, {totals['skipped']} ignoradas (sem geometria ou chave), "
+            f"{totals['deleted']} removidas."
+        ))
+
+    def before_import(self):
+        """Hook executado antes da carga."""
+
+    def after_import(self, totals):
+        """Hook executado após a carga e a atualização das estatísticas da camada."""
+
+    def report_progress(self, totals, total):
+        elapsed = totals["elapsed"]
+        self.stdout.write(
+            f"  {totals['read']}/{total} linhas lidas | {totals['inserted']} inseridas | "
+            f"{totals['updated']} atualizadas | {totals['unchanged']} sem alteração | {totals['read'] / elapsed if elapsed else 0:.0f} linhas/s"
+        )
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('control_panel', '0002_filemanagement_indigenous_zip_file'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LayerStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('layer', models.CharField(db_column='camada', help_text='Rótulo do modelo da camada (ex.: car_system.SicarRecord).', max_length=100, unique=True, verbose_name='Camada')),
+                ('row_count', models.BigIntegerField(db_column='quantidade_registros', default=0, verbose_name='Quantidade de Registros')),
+                ('refreshed_at', models.DateTimeField(auto_now=True, db_column='atualizado_em', verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Estatística de Camada',
+                'verbose_name_plural': 'Estatísticas de Camadas',
+                'db_table': 'tb_estatisticas_camadas',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('control_panel', '0003_layerstatistics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='layerstatistics',
+            name='data_version',
+            field=models.PositiveIntegerField(db_column='versao_dados', default=0, help_text='Incrementada a cada importação ou alteração da camada.', verbose_name='Versão dos Dados'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('control_panel', '0004_layerstatistics_data_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='filemanagement',
+            name='municipality_zip_file',
+            field=models.FileField(blank=True, help_text='Arquivo ZIP com a malha municipal do IBGE (CD_MUN, NM_MUN, SIGLA_UF).', null=True, upload_to='documents/', verbose_name='Documentos Limites Municipais'),
+        ),
+    ]
@@ -35,6 +35,14 @@ class FileManagement(models.Model):
         null = True,
         blank = True
     )
+
+    municipality_zip_file = models.FileField(
+        upload_to='documents/',
+        verbose_name="Documentos Limites Municipais",
+        help_text="Arquivo ZIP com a malha municipal do IBGE (CD_MUN, NM_MUN, SIGLA_UF).",
+        null=True,
+        blank=True
+    )
     class Meta:
         db_table = 'tb_gerenciamento_arquivos'
         verbose_name = "Gerenciamento de Arquivos"
@@ -43,3 +51,39 @@ class FileManagement(models.Model):
     def __str__(self):
         return f"Gerenciamento de Arquivos"
         
+
+class LayerStatistics(models.Model):
+    layer = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name="Camada",
+        db_column='camada',
+        help_text="Rótulo do modelo da camada (ex.: car_system.SicarRecord)."
+    )
+
+    row_count = models.BigIntegerField(
+        default=0,
+        verbose_name="Quantidade de Registros",
+        db_column='quantidade_registros'
+    )
+
+    data_version = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Versão dos Dados",
+        db_column='versao_dados',
+        help_text="Incrementada a cada importação ou alteração da camada."
+    )
+
+    refreshed_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Atualizado em",
+        db_column='atualizado_em'
+    )
+
+    class Meta:
+        db_table = 'tb_estatisticas_camadas'
+        verbose_name = "Estatística de Camada"
+        verbose_name_plural = "Estatísticas de Camadas"
+
+    def __str__(self):
+        return self.layer
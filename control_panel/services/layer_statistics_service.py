@@ -0,0 +1,131 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from control_panel.models import LayerStatistics
+
+
+class LayerStatisticsService:
+    """
+    Service responsible for the per-layer statistics (row counts) shown in the
+    analysis summary.
+
+    Counts are stored in LayerStatistics, refreshed by the import commands and
+    kept up to date by post_save/post_delete signals. Reads go through the Django
+    cache with a TTL. Layers that were never refreshed fall back to the
+    pg_class.reltuples estimate instead of a full COUNT(*).
+
+    Every import or row change also bumps the layer data_version, which the
+    analysis result cache uses to invalidate entries.
+    """
+
+    CACHE_KEY = "layer_statistics:{}"
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl if ttl is not None else getattr(settings, "LAYER_STATISTICS_TTL", 300)
+
+    # -----------------------------------------------------------
+    # Read
+    # -----------------------------------------------------------
+    def counts(self, layers):
+        """Return { layer_model: row_count } for the given layers."""
+        counts = {}
+        missing = []
+
+        for layer in layers:
+            cached = cache.get(self._cache_key(layer))
+
+            if cached is None:
+                missing.append(layer)
+            else:
+                counts[layer] = cached
+
+        if not missing:
+            return counts
+
+        stored = dict(
+            LayerStatistics.objects
+            .filter(layer__in=[self.label(layer) for layer in missing])
+            .values_list("layer", "row_count")
+        )
+
+        for layer in missing:
+            count = stored.get(self.label(layer))
+
+            if count is None:
+                count = self._estimate(layer)
+
+            cache.set(self._cache_key(layer), count, self.ttl)
+            counts[layer] = count
+
+        return counts
+
+    def versions(self, layers):
+        """Return { layer_model: data_version }. Always read from the database."""
+        stored = dict(
+            LayerStatistics.objects
+            .filter(layer__in=[self.label(layer) for layer in layers])
+            .values_list("layer", "data_version")
+        )
+        return {layer: stored.get(self.label(layer), 0) for layer in layers}
+
+    # -----------------------------------------------------------
+    # Write
+    # -----------------------------------------------------------
+    def refresh(self, layer):
+        """
+        Recount a layer (exact COUNT), store the result and bump its data version.
+        Used after imports.
+        """
+        count = layer.objects.count()
+
+        LayerStatistics.objects.get_or_create(layer=self.label(layer))
+        LayerStatistics.objects.filter(layer=self.label(layer)).update(
+            row_count=count,
+            data_version=F("data_version") + 1,
+            refreshed_at=timezone.now(),
+        )
+
+        cache.delete(self._cache_key(layer))
+        return count
+
+    def adjust(self, layer, delta):
+        """Apply a row count delta (signals) and bump the data version."""
+        LayerStatistics.objects.get_or_create(
+            layer=self.label(layer),
+            defaults={"row_count": self._estimate(layer) - delta},
+        )
+        LayerStatistics.objects.filter(layer=self.label(layer)).update(
+            row_count=F("row_count") + delta,
+            data_version=F("data_version") + 1,
+        )
+
+        cache.delete(self._cache_key(layer))
+
+    # -----------------------------------------------------------
+    # Helpers
+    # -----------------------------------------------------------
+    @staticmethod
+    def label(layer):
+        return layer._meta.label
+
+    def _cache_key(self, layer):
+        return self.CACHE_KEY.format(self.label(layer))
+
+    def _estimate(self, layer):
+        """Planner estimate from pg_class; exact COUNT when unavailable."""
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [layer._meta.db_table],
+                )
+                row = cursor.fetchone()
+
+            # reltuples is -1 (or 0) until the table is vacuumed/analyzed
+            if row and row[0] > 0:
+                return row[0]
+
+        return layer.objects.count()
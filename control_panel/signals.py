@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+
+from control_panel.services.layer_statistics_service import LayerStatisticsService
+
+
+def layer_saved(sender, instance, created, raw=False, **kwargs):
+    # Edits bump the data version too: cached analyses used the old geometry
+    if not raw:
+        LayerStatisticsService().adjust(sender, 1 if created else 0)
+
+
+def layer_deleted(sender, instance, **kwargs):
+    LayerStatisticsService().adjust(sender, -1)
+
+
+def connect_layer_statistics(*layers):
+    """Keep LayerStatistics (row count, data version) in sync with single-row saves/deletes of the given layers."""
+    for layer in layers:
+        post_save.connect(layer_saved, sender=layer, dispatch_uid=f"layer_saved_{layer._meta.label}")
+        post_delete.connect(layer_deleted, sender=layer, dispatch_uid=f"layer_deleted_{layer._meta.label}")
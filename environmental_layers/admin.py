@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ZoningArea, PhytoecologyArea, IndigenousArea, EnvironmentalProtectionArea
+from .models import ZoningArea, PhytoecologyArea, IndigenousArea, EnvironmentalProtectionArea, MunicipalityBoundary
 # Register your models here.
 from leaflet.admin import LeafletGeoAdmin
 
@@ -107,3 +107,24 @@ class IndigenousAreaAdmin(LeafletGeoAdmin):
     )
         
 admin.site.register(IndigenousArea, IndigenousAreaAdmin)
+
+class MunicipalityBoundaryAdmin(LeafletGeoAdmin):
+    list_display = ('municipality_name', 'state_acronym', 'municipality_code', 'area_ha')
+    search_fields = ('municipality_name', 'municipality_code')
+    list_filter = ('state_acronym',)
+
+    fieldsets = (
+        (None, {
+            'fields': ('municipality_code', 'municipality_name', 'state_acronym', 'geometry')
+        }),
+        (None, {
+            'fields': ('geometry_new', 'area_m2', 'area_ha')
+        }),
+    )
+
+    readonly_fields = (
+        'area_m2',
+        'area_ha',
+    )
+
+admin.site.register(MunicipalityBoundary, MunicipalityBoundaryAdmin)
@@ -3,3 +3,13 @@ from django.apps import AppConfig
 class EnvironmentalLayersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'environmental_layers'
+
+    def ready(self):
+        from control_panel.signals import connect_layer_statistics
+        from environmental_layers.models import (
+            ZoningArea, PhytoecologyArea, EnvironmentalProtectionArea, IndigenousArea, MunicipalityBoundary
+        )
+
+        connect_layer_statistics(
+            ZoningArea, PhytoecologyArea, EnvironmentalProtectionArea, IndigenousArea, MunicipalityBoundary
+        )
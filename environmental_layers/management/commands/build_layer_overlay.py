@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from kernel.service.overlay.layer_overlay_service import LayerOverlayService
+
+
+class Command(BaseCommand):
+    help = (
+        "(Re)constrói a sobreposição planar das camadas de LAYER_OVERLAY_LAYERS: cada face "
+        "guarda os ids das feições de cada camada que a cobrem. Usada pelo motor de análise "
+        "\"overlay\" (OVERLAP_ENGINE). Depois da primeira construção, os comandos de importação "
+        "dessas camadas a reconstroem."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Células da grade processadas em paralelo (uma conexão por worker)."
+        )
+        parser.add_argument(
+            "--cell-size",
+            type=float,
+            default=None,
+            help="Tamanho da célula da grade em graus (padrão: LAYER_OVERLAY_CELL_SIZE)."
+        )
+
+    def handle(self, *args, **options):
+        service = LayerOverlayService(cell_size=options["cell_size"])
+        labels = ", ".join(layer._meta.label for layer in service.layers())
+
+        self.stdout.write(f"Construindo a sobreposição planar de {labels} (células de {service.cell_size}°)...")
+        start = time.perf_counter()
+
+        def progress(done, total, faces):
+            self.stdout.write(f"  {done}/{total} células | {faces} faces")
+
+        faces = service.rebuild(workers=options["workers"], progress=progress)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✔ {service.TABLE}: {faces} faces em {time.perf_counter() - start:.1f}s"
+        ))
@@ -0,0 +1,49 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from control_panel.management.base import get_layer
+from kernel.service.subdivision.layer_subdivision_service import LayerSubdivisionService
+
+
+class Command(BaseCommand):
+    help = (
+        "(Re)constrói as tabelas <camada>_subdivided (ST_Subdivide) usadas pela análise "
+        "de sobreposição. Sem --layer, processa as camadas de OVERLAP_SUBDIVIDED_LAYERS. "
+        "Depois da primeira construção, os comandos de importação mantêm as tabelas atualizadas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--layer",
+            action="append",
+            help="Modelo da camada (app_label.Modelo ou nome do modelo). Pode ser repetido."
+        )
+        parser.add_argument(
+            "--max-vertices",
+            type=int,
+            default=None,
+            help="Máximo de vértices por pedaço (padrão: SUBDIVIDE_MAX_VERTICES)."
+        )
+
+    def handle(self, *args, **options):
+        names = options["layer"] or getattr(settings, "OVERLAP_SUBDIVIDED_LAYERS", [])
+        layers = [get_layer(name) for name in names]
+
+        service = LayerSubdivisionService(max_vertices=options["max_vertices"])
+
+        for layer in layers:
+            start = time.perf_counter()
+            self.stdout.write(f"Subdividindo {layer._meta.db_table} (máx. {service.max_vertices} vértices)...")
+
+            pieces = service.rebuild(layer)
+
+            self.stdout.write(self.style.SUCCESS(
+                f"✔ {service.table_name(layer)}: {pieces} pedaços em {time.perf_counter() - start:.1f}s"
+            ))
+
+            if not service.is_configured(layer):
+                self.stdout.write(self.style.WARNING(
+                    f"  {layer._meta.label} não está em OVERLAP_SUBDIVIDED_LAYERS; a análise não usará esta tabela."
+                ))
@@ -1,68 +1,149 @@
+import time
+
 from django.core.management.base import BaseCommand
-from django.db import connection
+from django.db import connection, transaction
+
+from control_panel.management.base import get_layer, sync_derived_data
+from kernel.service.import_engine.geometry_columns import SRID, UTM_SRID
+
 
 class Command(BaseCommand):
     help = (
-        "Reprocessa geometrias da tabela tb_area_zoneamento: "
-        "0) Corrige o SRID da COLUNA para 4674 (se estiver 4326) "
-        "1) Converte WKT para geometry com SRID=4674 "
+        "Backfill de geometrias de uma camada (os importadores já preenchem esses campos): "
+        "1) Converte o WKT (coordenadas_geograficas) para geometria_tmp com SRID=4674 "
         "2) Corrige SRID incorreto diretamente na geometria "
-        "3) Recalcula áreas em m² e ha usando UTM Zona 22S (EPSG:31982)"
+        "3) Calcula áreas em m² e ha usando UTM Zona 22S (EPSG:31982) "
+        "4) Preenche geometria_utm nas camadas de PROJECTED_GEOMETRY_LAYERS "
+        "5) Atualiza os dados derivados (tabela subdividida, sobreposições) dos registros alterados. "
+        "Processa em lotes por id; cada lote é confirmado separadamente, então a "
+        "execução pode ser interrompida e retomada."
     )
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--layer",
+            required=True,
+            help="Modelo da camada: app_label.Modelo (ex.: car_system.SicarRecord) ou apenas o nome do modelo."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Quantidade de registros atualizados por lote."
+        )
+        parser.add_argument(
+            "--start-id",
+            type=int,
+            default=0,
+            help="Retoma a partir deste id (exclusivo)."
+        )
+        parser.add_argument(
+            "--fix-column-srid",
+            action="store_true",
+            help="Antes do backfill, altera o tipo da coluna para geometry(MultiPolygon, 4674)."
+        )
+
     def handle(self, *args, **options):
-        table_name = "tb_registro_sicar"
+        model = get_layer(options["layer"])
+        qn = connection.ops.quote_name
+        table_name = qn(model._meta.db_table)
+
+        self.stdout.write(self.style.WARNING(
+            f"\n🚀 Iniciando backfill das geometrias de {model._meta.db_table}...\n"
+        ))
+
+        if options["fix_column_srid"]:
+            self.stdout.write("0️⃣ Ajustando tipo/SRID da coluna...")
+            with connection.cursor() as cursor:
+                cursor.execute(f"""
+                    ALTER TABLE {table_name}
+                    ALTER COLUMN geometria_tmp
+                    TYPE geometry(MultiPolygon, {SRID})
+                    USING ST_Multi(ST_SetSRID(geometria_tmp, {SRID}));
+                """)
+            self.stdout.write(self.style.SUCCESS(f"✔ Coluna ajustada para MultiPolygon/{SRID}."))
+
+        last_id = options["start_id"]
+        total = 0
+        start = time.perf_counter()
 
+        # Database clock: the converted rows get atualizado_em = now() of their batch
         with connection.cursor() as cursor:
+            cursor.execute("SELECT now()")
+            started_at = cursor.fetchone()[0]
 
-            self.stdout.write(self.style.WARNING(
-                f"\n🚀 Iniciando reprocessamento das geometrias de {table_name}...\n"
-            ))
-
-            # 0) AJUSTAR SRID DA COLUNA DO BANCO (IMPORTANTÍSSIMO)
-            self.stdout.write("0️⃣ Ajustando SRID da coluna (se estiver diferente)...")
-
-            cursor.execute(f"""
-                ALTER TABLE {table_name}
-                ALTER COLUMN geometria_tmp
-                TYPE geometry(MultiPolygon, 4674)
-                USING ST_SetSRID(geometria_tmp, 4674);
-            """)
-
-            self.stdout.write(self.style.SUCCESS("✔ Coluna ajustada para SRID 4674."))
-
-            # 1) Converter WKT para geometria_tmp com SRID=4674
-            self.stdout.write("1️⃣ Convertendo WKT → geometria_tmp (SRID 4674)...")
-            cursor.execute(f"""
-                UPDATE {table_name}
-                SET geometria_tmp = ST_GeomFromText(coordenadas_geograficas, 4674)
-                WHERE coordenadas_geograficas IS NOT NULL
-                AND geometria_tmp IS NULL;
-            """)
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name} WHERE geometria_tmp IS NOT NULL;")
-            converted = cursor.fetchone()[0]
-            self.stdout.write(self.style.SUCCESS(f"✔ Geometrias convertidas: {converted}"))
-
-            # 2) Corrigir SRID se estiver incorreto
-            self.stdout.write("2️⃣ Corrigindo SRID incorreto (se houver)...")
-            cursor.execute(f"""
-                UPDATE {table_name}
-                SET geometria_tmp = ST_SetSRID(geometria_tmp, 4674)
-                WHERE ST_SRID(geometria_tmp) <> 4674;
-            """)
-            self.stdout.write(self.style.SUCCESS("✔ SRIDs corrigidos."))
-
-            # 3) Recalcular áreas fixas (m² e ha) em UTM zona 22S (EPSG 31982)
-            self.stdout.write("3️⃣ Calculando áreas fixas (m² e ha) usando UTM 22S (EPSG:31982)...")
-            cursor.execute(f"""
-                UPDATE {table_name}
-                SET 
-                    area_m2 = ST_Area(ST_Transform(geometria_tmp, 31982)),
-                    area_ha = ST_Area(ST_Transform(geometria_tmp, 31982)) / 10000
-                WHERE geometria_tmp IS NOT NULL;
-            """)
-            self.stdout.write(self.style.SUCCESS("✔ Áreas calculadas e atualizadas!"))
+        while True:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(self.batch_sql(model), [last_id, options["batch_size"]])
+                updated_ids = [row[0] for row in cursor.fetchall()]
+
+            if not updated_ids:
+                break
+
+            last_id = max(updated_ids)
+            total += len(updated_ids)
+
+            self.stdout.write(
+                f"✔ {total} registros atualizados (último id: {last_id}, "
+                f"{total / (time.perf_counter() - start):.0f} registros/s)"
+            )
+
+        if total:
+            sync_derived_data(model, started_at, self.stdout)
 
         self.stdout.write(self.style.SUCCESS(
-            "\n🎉 Reprocessamento concluído com sucesso!\n"
+            f"\n🎉 Backfill concluído: {total} registros atualizados.\n"
         ))
+
+    # -----------------------------------------------------------
+    # Helpers
+    # -----------------------------------------------------------
+    @staticmethod
+    def batch_sql(model):
+        """
+        Updates the next batch (by id) of rows still missing geometry, area,
+        projected geometry (when the layer keeps one) or with a wrong SRID.
+        Rows already converted never match again, so re-running the command
+        resumes where it stopped. atualizado_em is bumped so the derived
+        tables (subdivided pieces, CAR overlaps) pick the new geometry up.
+        """
+        table_name = connection.ops.quote_name(model._meta.db_table)
+        projected = model.stores_projected_geometry()
+
+        missing_projection = "OR geometria_utm IS NULL" if projected else ""
+        set_projection = "geometria_utm = b.geom_utm," if projected else ""
+
+        return f"""
+            WITH batch AS (
+                SELECT id, geom, ST_Transform(geom, {UTM_SRID}) AS geom_utm
+                FROM (
+                    SELECT
+                        id,
+                        CASE
+                            WHEN geometria_tmp IS NULL
+                                THEN ST_Multi(ST_GeomFromText(coordenadas_geograficas, {SRID}))
+                            ELSE ST_SetSRID(geometria_tmp, {SRID})
+                        END AS geom
+                    FROM {table_name}
+                    WHERE id > %s
+                      AND (
+                          (geometria_tmp IS NULL AND coordenadas_geograficas IS NOT NULL)
+                          OR (geometria_tmp IS NOT NULL AND (
+                              area_m2 IS NULL OR ST_SRID(geometria_tmp) <> {SRID} {missing_projection}
+                          ))
+                      )
+                    ORDER BY id
+                    LIMIT %s
+                ) pending
+            )
+            UPDATE {table_name} t
+            SET
+                geometria_tmp = b.geom,
+                {set_projection}
+                area_m2 = ST_Area(b.geom_utm),
+                area_ha = ST_Area(b.geom_utm) / 10000,
+                atualizado_em = now()
+            FROM batch b
+            WHERE t.id = b.id
+            RETURNING t.id;
+        """
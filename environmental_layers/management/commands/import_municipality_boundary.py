@@ -0,0 +1,22 @@
+from control_panel.management.base import LayerImportCommand
+from environmental_layers.models import MunicipalityBoundary
+from kernel.service.import_engine.layer_import_spec import LayerImportSpec
+
+
+class Command(LayerImportCommand):
+    help = "Importa a malha municipal do IBGE usada para localizar município/UF sem acesso à internet."
+
+    default_on_conflict = "update"
+
+    spec = LayerImportSpec(
+        model=MunicipalityBoundary,
+        file_field="municipality_zip_file",
+        field_mapping={
+            "municipality_code": "CD_MUN",
+            "municipality_name": "NM_MUN",
+            "state_acronym": "SIGLA_UF",
+        },
+        dedupe_field="municipality_code",
+        source="Malha Municipal IBGE",
+        label="limites municipais",
+    )
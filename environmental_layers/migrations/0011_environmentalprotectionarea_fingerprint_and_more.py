@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('environmental_layers', '0010_alter_environmentalprotectionarea_geometry_new_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='environmentalprotectionarea',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_column='impressao_digital', max_length=16, null=True, verbose_name='Impressão Digital'),
+        ),
+        migrations.AddField(
+            model_name='indigenousarea',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_column='impressao_digital', max_length=16, null=True, verbose_name='Impressão Digital'),
+        ),
+        migrations.AddField(
+            model_name='phytoecologyarea',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_column='impressao_digital', max_length=16, null=True, verbose_name='Impressão Digital'),
+        ),
+        migrations.AddField(
+            model_name='zoningarea',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_column='impressao_digital', max_length=16, null=True, verbose_name='Impressão Digital'),
+        ),
+    ]
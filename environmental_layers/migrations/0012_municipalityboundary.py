@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:06
+
+import django.contrib.gis.db.models.fields
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('environmental_layers', '0011_environmentalprotectionarea_fingerprint_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MunicipalityBoundary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('geometry', models.TextField(db_column='coordenadas_geograficas', verbose_name='Coordenadas Geográficas')),
+                ('geometry_new', django.contrib.gis.db.models.fields.GeometryField(blank=True, db_column='geometria_tmp', null=True, srid=4674)),
+                ('area_m2', models.FloatField(blank=True, db_column='area_m2', null=True, verbose_name='Área (m²)')),
+                ('area_ha', models.FloatField(blank=True, db_column='area_ha', null=True, verbose_name='Área (ha)')),
+                ('fingerprint', models.CharField(blank=True, db_column='impressao_digital', max_length=16, null=True, verbose_name='Impressão Digital')),
+                ('source', models.CharField(blank=True, max_length=100, null=True, verbose_name='Fonte de Dados')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_column='criado_em', verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_column='atualizado_em', verbose_name='Atualizado em')),
+                ('municipality_code', models.CharField(db_column='codigo_ibge', max_length=7, unique=True, verbose_name='Código IBGE')),
+                ('municipality_name', models.CharField(db_column='nome_municipio', max_length=100, verbose_name='Município')),
+                ('state_acronym', models.CharField(db_column='sigla_uf', max_length=2, verbose_name='UF')),
+                ('created_by', models.ForeignKey(blank=True, db_column='id_criado_por', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL, verbose_name='Criado por')),
+                ('updated_by', models.ForeignKey(blank=True, db_column='id_atualizado_por', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated', to=settings.AUTH_USER_MODEL, verbose_name='Atualizado por')),
+            ],
+            options={
+                'verbose_name': 'Limite Municipal',
+                'verbose_name_plural': 'Limites Municipais',
+                'db_table': 'tb_limite_municipal',
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:33
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('environmental_layers', '0013_environmentalprotectionarea_geometry_utm_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='environmentalprotectionarea',
+            name='geometry_utm',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, db_column='geometria_utm', null=True, spatial_index=False, srid=31982, verbose_name='Geometria UTM'),
+        ),
+        migrations.AlterField(
+            model_name='indigenousarea',
+            name='geometry_utm',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, db_column='geometria_utm', null=True, spatial_index=False, srid=31982, verbose_name='Geometria UTM'),
+        ),
+        migrations.AlterField(
+            model_name='municipalityboundary',
+            name='geometry_utm',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, db_column='geometria_utm', null=True, spatial_index=False, srid=31982, verbose_name='Geometria UTM'),
+        ),
+        migrations.AlterField(
+            model_name='phytoecologyarea',
+            name='geometry_utm',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, db_column='geometria_utm', null=True, spatial_index=False, srid=31982, verbose_name='Geometria UTM'),
+        ),
+        migrations.AlterField(
+            model_name='zoningarea',
+            name='geometry_utm',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, db_column='geometria_utm', null=True, spatial_index=False, srid=31982, verbose_name='Geometria UTM'),
+        ),
+    ]
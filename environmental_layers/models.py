@@ -124,3 +124,32 @@ class IndigenousArea(GeoBaseModel):
 
     def __str__(self):
         return self.indigenous_name
+
+
+class MunicipalityBoundary(GeoBaseModel):
+    municipality_code = models.CharField(
+        max_length=7,
+        unique=True,
+        verbose_name="Código IBGE",
+        db_column='codigo_ibge'
+    )
+
+    municipality_name = models.CharField(
+        max_length=100,
+        verbose_name="Município",
+        db_column='nome_municipio'
+    )
+
+    state_acronym = models.CharField(
+        max_length=2,
+        verbose_name="UF",
+        db_column='sigla_uf'
+    )
+
+    class Meta:
+        db_table = 'tb_limite_municipal'
+        verbose_name = "Limite Municipal"
+        verbose_name_plural = "Limites Municipais"
+
+    def __str__(self):
+        return f"{self.municipality_name}/{self.state_acronym}"
@@ -2,6 +2,8 @@ from kernel.service.abstract.base_formatter import BaseFormatter
 
 
 class PhytoecologyFormatter(BaseFormatter):
+    fields = ("phyto_name",)
+
     def format(self, model_obj, intersec):
         return {
             "area": intersec["intersection_area_ha"],
@@ -2,6 +2,8 @@ from kernel.service.abstract.base_formatter import BaseFormatter
 
 
 class ProtectionAreaFormatter(BaseFormatter):
+    fields = ("unit_name", "domains", "class_group", "legal_basis")
+
     def format(self, model_obj, intersec):
         return {
             "area": intersec["intersection_area_ha"],
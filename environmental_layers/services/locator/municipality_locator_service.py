@@ -0,0 +1,64 @@
+from typing import Optional, Tuple
+
+from django.contrib.gis.geos import GEOSException, GEOSGeometry
+
+from environmental_layers.models import MunicipalityBoundary
+from kernel.service.import_engine.geometry_columns import SRID
+
+
+class MunicipalityLocatorService:
+    """
+    Locates the city and state (UF) of a geometry offline, with an indexed
+    point-in-polygon query on the IBGE municipality boundary layer.
+
+    Same contract as CityStateLocatorService.locate: returns (city, UF), or
+    (None, None) when the geometry is invalid or not covered by the layer.
+    """
+
+    def locate(self, geometry, method: str = "representative") -> Tuple[Optional[str], Optional[str]]:
+        geometry = self._load_geometry(geometry)
+        if geometry is None:
+            return None, None
+
+        point = self._extract_lookup_point(geometry, method)
+
+        match = (
+            MunicipalityBoundary.objects
+            .filter(geometry_new__intersects=point)
+            .values_list("municipality_name", "state_acronym")
+            .first()
+        )
+
+        return match or (None, None)
+
+    # -------------------------------------------------------------------------
+    #                              PRIVATE METHODS
+    # -------------------------------------------------------------------------
+
+    def _load_geometry(self, geometry):
+        """Accepts WKT or a GEOSGeometry (SRID 4674 assumed when missing)."""
+        if not isinstance(geometry, GEOSGeometry):
+            try:
+                geometry = GEOSGeometry(str(geometry))
+            except (GEOSException, ValueError, TypeError):
+                return None
+
+        if geometry.geom_type not in ("Polygon", "MultiPolygon"):
+            return None
+
+        if geometry.srid is None:
+            geometry = geometry.clone()
+            geometry.srid = SRID
+
+        return geometry
+
+    def _extract_lookup_point(self, geometry, method: str):
+        if method == "representative":
+            point = geometry.point_on_surface
+        else:
+            point = geometry.centroid
+
+        if point.srid != SRID:
+            point = point.transform(SRID, clone=True)
+
+        return point
@@ -18,6 +18,19 @@ class GeoBaseModel(models.Model):
         db_column="geometria_tmp",
     )
     
+    # Copy of geometry_new in UTM 22S, kept only for the layers listed in
+    # PROJECTED_GEOMETRY_LAYERS (see stores_projected_geometry); NULL (no
+    # storage) elsewhere. Not indexed: candidates are always found through
+    # geometry_new, this column is only read for the intersection itself
+    geometry_utm = gis_models.GeometryField(
+        srid=31982,
+        null=True,
+        blank=True,
+        spatial_index=False,
+        db_column="geometria_utm",
+        verbose_name="Geometria UTM",
+    )
+
     area_m2 = models.FloatField(
         verbose_name="Área (m²)",
         db_column="area_m2",
@@ -32,6 +45,14 @@ class GeoBaseModel(models.Model):
         blank=True
     )
     
+    fingerprint = models.CharField(
+        max_length=16,
+        verbose_name="Impressão Digital",
+        db_column="impressao_digital",
+        null=True,
+        blank=True
+    )
+
     source = models.CharField(
         max_length=100,
         verbose_name="Fonte de Dados",
@@ -71,3 +92,23 @@ class GeoBaseModel(models.Model):
 
     class Meta:
         abstract = True
+
+    @classmethod
+    def stores_projected_geometry(cls):
+        return cls._meta.label in getattr(settings, "PROJECTED_GEOMETRY_LAYERS", ())
+
+    def save(self, *args, **kwargs):
+        # Keep the projected copy (and the areas derived from it) in sync with geometry_new
+        if self.stores_projected_geometry():
+            if self.geometry_new is None:
+                self.geometry_utm = None
+            else:
+                self.geometry_utm = self.geometry_new.transform(31982, clone=True)
+                self.area_m2 = self.geometry_utm.area
+                self.area_ha = self.area_m2 / 10000
+
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "geometry_new" in update_fields:
+                kwargs["update_fields"] = {*update_fields, "geometry_utm", "area_m2", "area_ha"}
+
+        super().save(*args, **kwargs)
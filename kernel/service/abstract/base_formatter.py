@@ -1,3 +1,6 @@
 class BaseFormatter:
+    # Model attributes read by format(); lets the overlap engine load only these columns.
+    fields = ()
+
     def format(self, model_obj, intersec_data):
         raise NotImplementedError
@@ -1,18 +1,17 @@
-import requests
 import unicodedata
 from shapely import wkt
 from shapely.geometry import Polygon, MultiPolygon
 from typing import Optional, Tuple
 
+from kernel.service.geocoding.nominatim_client import get_nominatim_client
+
 
 class CityStateLocatorService:
     """
     Service responsible for locating the city and state (UF) from a WKT geometry.
+    Reverse geocoding goes through the shared NominatimClient (cache, rate limit, retries).
     """
 
-    NOMINATIM_URL = "https://nominatim.openstreetmap.org/reverse"
-    HEADERS = {"User-Agent": "OverlayPlatform/1.0 (contact@example.com)"}
-
     STATES_MAP = {
         "acre": "AC",
         "alagoas": "AL",
@@ -43,6 +42,9 @@ class CityStateLocatorService:
         "tocantins": "TO",
     }
 
+    def __init__(self, client=None):
+        self.client = client or get_nominatim_client()
+
     def locate(self, wkt_str: str, method: str = "representative") -> Tuple[Optional[str], Optional[str]]:
         """
         Main flow: receives a WKT polygon and returns (city, state UF).
@@ -86,23 +88,8 @@ class CityStateLocatorService:
         return point.x, point.y  # lon, lat
 
     def _query_nominatim(self, lat: float, lon: float):
-        params = {
-            "lat": lat,
-            "lon": lon,
-            "format": "json",
-            "accept-language": "pt-BR",
-            "addressdetails": 1,
-        }
-
         try:
-            response = requests.get(
-                self.NOMINATIM_URL,
-                params=params,
-                headers=self.HEADERS,
-                timeout=20
-            )
-            response.raise_for_status()
-            return response.json()
+            return self.client.reverse(lat, lon)
         except Exception:
             return None
 
@@ -0,0 +1,250 @@
+import logging
+import math
+import threading
+import time
+from concurrent.futures import Future
+
+import requests
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "URL": "https://nominatim.openstreetmap.org/reverse",
+    "USER_AGENT": "OverlayPlatform/1.0 (contact@example.com)",
+    "TIMEOUT": 10,
+    "DEADLINE": 8,
+    "RATE": 1.0,
+    "RETRIES": 3,
+    "BACKOFF": 1.0,
+    "CACHE_ALIAS": "default",
+    "RATE_LIMIT_CACHE_ALIAS": None,
+    "CACHE_TTL": 60 * 60 * 24 * 30,
+    "PRECISION": 4,
+}
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class SharedRateLimiter:
+    """
+    Rate limit shared by every process using the same cache: time is cut
+    in slots of 1/rate seconds and a request must first claim its slot with
+    cache.add. Per-process limiters would multiply the rate by the number
+    of web/worker processes.
+
+    The cache must be shared and its add() atomic (database, Redis,
+    memcached; not locmem or file). While it is unavailable (e.g. cache
+    table not created) the limit falls back to this process only.
+    """
+
+    def __init__(self, rate, cache_alias, key="nominatim:slot"):
+        self.interval = 1.0 / rate
+        self.cache_alias = cache_alias
+        self.key = key
+
+        self._next_local = 0.0
+        self._local_lock = threading.Lock()
+
+    def acquire(self, deadline=None) -> bool:
+        """
+        Block until a slot is claimed. Returns False, without claiming one,
+        when the next free slot starts after `deadline` (time.time()).
+        """
+        cache = caches[self.cache_alias]
+        # Claimed slots only need to outlive their own interval
+        timeout = max(1, math.ceil(self.interval * 2))
+
+        while True:
+            now = time.time()
+            slot = int(now // self.interval)
+
+            try:
+                claimed = cache.add(f"{self.key}:{slot}", 1, timeout)
+            except DatabaseError as e:
+                logger.warning("Shared rate limit unavailable, limiting per process: %s", e)
+                return self._acquire_locally(deadline)
+
+            if claimed:
+                return True
+
+            next_slot_at = (slot + 1) * self.interval
+            if deadline is not None and next_slot_at > deadline:
+                return False
+
+            time.sleep(next_slot_at - now)
+
+    def _acquire_locally(self, deadline):
+        with self._local_lock:
+            now = time.time()
+            start_at = max(now, self._next_local)
+
+            if deadline is not None and start_at > deadline:
+                return False
+
+            self._next_local = start_at + self.interval
+
+        time.sleep(start_at - now)
+        return True
+
+
+class NominatimClient:
+    """
+    Reverse geocoding client for Nominatim.
+
+    - Responses are cached (Django cache alias, persistent when that alias
+      is a file/DB backend) by the lookup point rounded to PRECISION decimals
+    - Concurrent lookups of the same point share a single HTTP request
+    - Requests go through a rate limit shared by all processes (RATE per
+      second, Nominatim usage policy is 1/s; see SharedRateLimiter) and are
+      retried with exponential backoff on network errors, 429 and 5xx
+      (Retry-After honored)
+    - A lookup never takes more than DEADLINE seconds (rate limit waits,
+      HTTP timeouts and backoffs included); past it, it gives up with None
+    - One pooled requests.Session is reused for every call
+
+    Options come from settings.NOMINATIM; URL can point to a local stub server.
+    """
+
+    def __init__(self, options=None, session=None):
+        self.options = {**DEFAULTS, **getattr(settings, "NOMINATIM", {}), **(options or {})}
+        self.session = session or self._build_session()
+        self.limiter = SharedRateLimiter(
+            self.options["RATE"],
+            self.options["RATE_LIMIT_CACHE_ALIAS"] or self.options["CACHE_ALIAS"],
+        )
+
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+
+    def reverse(self, lat: float, lon: float):
+        """Reverse geocode a point. Returns the Nominatim JSON, or None on failure."""
+        key = self.cache_key(lat, lon)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            data = self._fetch(lat, lon)
+            if data is not None:
+                self.cache.set(key, data, self.options["CACHE_TTL"])
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.pop(key, None)
+
+    @property
+    def cache(self):
+        return caches[self.options["CACHE_ALIAS"]]
+
+    def cache_key(self, lat, lon):
+        precision = self.options["PRECISION"]
+        return f"nominatim:{round(lat, precision)}:{round(lon, precision)}"
+
+    # -----------------------------------------------------------
+    # HTTP
+    # -----------------------------------------------------------
+    def _fetch(self, lat, lon):
+        params = {
+            "lat": lat,
+            "lon": lon,
+            "format": "json",
+            "accept-language": "pt-BR",
+            "addressdetails": 1,
+        }
+
+        retries = self.options["RETRIES"]
+        deadline = time.time() + self.options["DEADLINE"]
+
+        for attempt in range(retries + 1):
+            if not self.limiter.acquire(deadline):
+                break
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+
+            try:
+                response = self.session.get(
+                    self.options["URL"],
+                    params=params,
+                    timeout=min(self.options["TIMEOUT"], remaining),
+                )
+            except requests.RequestException as e:
+                logger.warning("Nominatim request failed (attempt %s): %s", attempt + 1, e)
+                delay = self._backoff(attempt)
+            else:
+                if response.status_code not in RETRY_STATUS:
+                    try:
+                        response.raise_for_status()
+                        return response.json()
+                    except ValueError as e:
+                        logger.warning("Invalid Nominatim response: %s", e)
+                        return None
+                    except requests.HTTPError as e:
+                        logger.warning("Nominatim request rejected: %s", e)
+                        return None
+
+                logger.warning("Nominatim returned %s (attempt %s)", response.status_code, attempt + 1)
+                delay = self._retry_after(response) or self._backoff(attempt)
+
+            if attempt < retries:
+                if time.time() + delay >= deadline:
+                    break
+                time.sleep(delay)
+
+        logger.warning("Nominatim lookup gave up for (%s, %s)", lat, lon)
+        return None
+
+    def _backoff(self, attempt):
+        return self.options["BACKOFF"] * (2 ** attempt)
+
+    @staticmethod
+    def _retry_after(response):
+        try:
+            return float(response.headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
+
+    def _build_session(self):
+        session = requests.Session()
+        session.headers.update({"User-Agent": self.options["USER_AGENT"]})
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=10)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        return session
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_nominatim_client():
+    """Process-wide client, so every request shares the rate limit, the pool and the in-flight lookups."""
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = NominatimClient()
+
+    return _client
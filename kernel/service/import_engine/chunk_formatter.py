@@ -0,0 +1,151 @@
+import hashlib
+import json
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import pandas as pd
+
+from kernel.service.import_engine.shapefile_reader import read_chunk
+
+
+@dataclass
+class FormattedChunk:
+    """
+    Loader rows of a chunk plus the identity of every feature read (for delta
+    imports) and the number of features dropped (no geometry or no key).
+    """
+
+    rows: list
+    identities: list
+    skipped: int = 0
+
+
+@dataclass(frozen=True)
+class ChunkFormatter:
+    """
+    Turns a chunk of a layer shapefile into rows for the CopyLoader.
+
+    Holds only plain data (no Django objects) so it can be sent to worker
+    processes; each worker reads its own chunk from the file, so geometries
+    never travel from the parent to the workers.
+
+    Features without geometry, or without a value in the source column of
+    dedupe_field, are dropped: a missing key would be stored as "" and every
+    such feature would be upserted into the same row.
+
+    When known_fingerprints is given, features whose fingerprint is already
+    stored are unchanged: they are only reported in `identities` and the
+    content hash is not computed for them.
+    """
+
+    path: str
+    field_mapping: tuple        # ((model field, shapefile column), ...)
+    date_formats: dict
+    not_null_fields: tuple
+    hash_field: Optional[str]
+    identity_field: str
+    dedupe_field: Optional[str]
+    created_by_id: int
+    created_by_name: str
+    source: str
+    encoding: str = "utf-8"
+    known_fingerprints: Optional[frozenset] = None
+
+    @property
+    def source_columns(self):
+        return [column for _, column in self.field_mapping]
+
+    def read_and_format(self, offset, chunk_size):
+        chunk = read_chunk(self.path, offset, chunk_size, self.source_columns, self.encoding)
+        return self.format(chunk)
+
+    def format(self, chunk):
+        read = len(chunk)
+        keep = chunk.geometry.notna()
+
+        dedupe_column = dict(self.field_mapping).get(self.dedupe_field)
+        if dedupe_column is not None:
+            keep &= chunk[dedupe_column].notna() if dedupe_column in chunk else False
+
+        chunk = chunk[keep]
+
+        columns = {
+            field: chunk[column].tolist() if column in chunk else [None] * len(chunk)
+            for field, column in self.field_mapping
+        }
+        wkbs = chunk.geometry.to_wkb().tolist()
+        fingerprints = self.fingerprints(columns, wkbs)
+        geometries = chunk.geometry.tolist()
+
+        rows = []
+        identities = []
+
+        for i, wkb in enumerate(wkbs):
+            values = {field: columns[field][i] for field, _ in self.field_mapping}
+            row = [self._clean(field, value) for field, value in values.items()]
+
+            if self.identity_field == "fingerprint":
+                identities.append(fingerprints[i])
+            else:
+                identities.append(row[list(values).index(self.identity_field)])
+
+            if self.known_fingerprints is not None and fingerprints[i] in self.known_fingerprints:
+                continue
+
+            if self.hash_field:
+                row.append(self.generate_hash(values, str(geometries[i])))
+
+            row += [fingerprints[i], self.created_by_id, self.source, wkb]
+            rows.append(tuple(row))
+
+        return FormattedChunk(rows, identities, skipped=read - len(chunk))
+
+    @staticmethod
+    def fingerprints(columns, wkbs):
+        """Cheap vectorized 64-bit fingerprint of each feature (attributes + geometry WKB)."""
+        frame = pd.DataFrame({**columns, "geometry": wkbs})
+        hashes = pd.util.hash_pandas_object(frame, index=False)
+        return [f"{value:016x}" for value in hashes]
+
+    def generate_hash(self, values, wkt):
+        """Same recipe the importers always used: SHA-256 of the sorted JSON of the formatted row."""
+        data = {
+            **values,
+            "geometry": wkt,
+            "created_by": self.created_by_name,
+            "source": self.source,
+        }
+        json_str = json.dumps(data, sort_keys=True, default=str)
+        return hashlib.sha256(json_str.encode("utf-8")).hexdigest()
+
+    def _clean(self, field, value):
+        if isinstance(value, float) and math.isnan(value):
+            value = None
+
+        if field in self.date_formats:
+            try:
+                return datetime.strptime(value, self.date_formats[field]).date()
+            except (ValueError, TypeError):
+                return None
+
+        if value is None and field in self.not_null_fields:
+            return ""
+
+        return value
+
+
+# ---------------------------------------------------------------
+# Process pool entry points (the formatter is sent once per worker)
+# ---------------------------------------------------------------
+_worker_formatter = None
+
+
+def init_worker(formatter):
+    global _worker_formatter
+    _worker_formatter = formatter
+
+
+def format_chunk_in_worker(offset, chunk_size):
+    return _worker_formatter.read_and_format(offset, chunk_size)
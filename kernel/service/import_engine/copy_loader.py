@@ -0,0 +1,138 @@
+from django.db import connection, transaction
+
+from kernel.service.import_engine.geometry_columns import SRID, UTM_SRID
+
+
+class CopyLoader:
+    """
+    Bulk loader for GeoBaseModel layers.
+
+    Each batch is streamed with COPY into a temporary staging table (geometry
+    as WKB) and merged into the layer table with a single
+    INSERT ... SELECT ... ON CONFLICT statement. The merge also fills the WKT
+    text, the PostGIS geometry (geometry_new), its UTM copy (geometry_utm, for
+    layers that keep one) and the precomputed areas, so no later `convert`
+    pass is needed.
+
+    Rows are tuples with the values of `fields` (in order) followed by the
+    geometry WKB.
+    """
+
+    GEOMETRY_WKB_COLUMN = "geom_wkb"
+
+    def __init__(self, model, fields, conflict_field, on_conflict="nothing", srid=SRID):
+        if on_conflict not in ("nothing", "update"):
+            raise ValueError(f"Invalid on_conflict: {on_conflict}")
+
+        self.model = model
+        self.fields = [model._meta.get_field(name) for name in fields]
+        self.conflict_field = model._meta.get_field(conflict_field)
+        self.on_conflict = on_conflict
+        self.srid = srid
+
+    def load(self, rows) -> dict:
+        """Load one batch. Returns {"inserted": n, "updated": n}."""
+        if not rows:
+            return {"inserted": 0, "updated": 0}
+
+        staging = f"staging_{self.model._meta.db_table}"
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(self._create_staging_sql(staging))
+
+            with cursor.copy(self._copy_sql(staging)) as copy:
+                for row in rows:
+                    copy.write_row(row)
+
+            cursor.execute(self._merge_sql(staging))
+            results = cursor.fetchall()
+
+        inserted = sum(1 for (was_inserted,) in results if was_inserted)
+        return {"inserted": inserted, "updated": len(results) - inserted}
+
+    # -----------------------------------------------------------
+    # SQL
+    # -----------------------------------------------------------
+    def _create_staging_sql(self, staging):
+        qn = connection.ops.quote_name
+        columns = ", ".join(qn(field.column) for field in self.fields)
+
+        # Same column types as the layer table, no constraints; dropped on commit
+        return f"""
+            CREATE TEMP TABLE {qn(staging)} ON COMMIT DROP AS
+            SELECT {columns}, NULL::bytea AS {self.GEOMETRY_WKB_COLUMN}
+            FROM {qn(self.model._meta.db_table)}
+            WITH NO DATA
+        """
+
+    def _copy_sql(self, staging):
+        qn = connection.ops.quote_name
+        columns = ", ".join([qn(field.column) for field in self.fields] + [self.GEOMETRY_WKB_COLUMN])
+        return f"COPY {qn(staging)} ({columns}) FROM STDIN"
+
+    def _merge_sql(self, staging):
+        qn = connection.ops.quote_name
+        meta = self.model._meta
+
+        target_columns = [qn(field.column) for field in self.fields]
+        select_values = [f"s.{column}" for column in target_columns]
+
+        target_columns += [
+            qn(meta.get_field("geometry").column),
+            qn(meta.get_field("geometry_new").column),
+            qn(meta.get_field("area_m2").column),
+            qn(meta.get_field("area_ha").column),
+        ]
+        select_values += [
+            "ST_AsText(g.geom)",
+            "g.geom",
+            "a.area_m2",
+            "a.area_m2 / 10000",
+        ]
+
+        if self.model.stores_projected_geometry():
+            target_columns.append(qn(meta.get_field("geometry_utm").column))
+            select_values.append("p.geom")
+
+        # auto_now / auto_now_add are only applied by Model.save(); set them here
+        timestamp_columns = [
+            qn(field.column)
+            for field in meta.concrete_fields
+            if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+        ]
+        target_columns += timestamp_columns
+        select_values += ["now()"] * len(timestamp_columns)
+
+        conflict_column = qn(self.conflict_field.column)
+
+        if self.on_conflict == "update":
+            updated_columns = [
+                column for column in target_columns
+                if column != conflict_column
+                and column != qn(meta.get_field("created_at").column)
+            ]
+            conflict_action = "DO UPDATE SET " + ", ".join(
+                f"{column} = EXCLUDED.{column}" for column in updated_columns
+            )
+        else:
+            conflict_action = "DO NOTHING"
+
+        # DISTINCT ON: a key repeated inside the batch would make ON CONFLICT fail
+        return f"""
+            INSERT INTO {qn(meta.db_table)} ({", ".join(target_columns)})
+            SELECT DISTINCT ON (s.{conflict_column}) {", ".join(select_values)}
+            FROM {qn(staging)} s
+            CROSS JOIN LATERAL (
+                SELECT ST_Multi(ST_GeomFromWKB(s.{self.GEOMETRY_WKB_COLUMN}, {self.srid})) AS geom
+            ) g
+            CROSS JOIN LATERAL (
+                SELECT ST_Transform(g.geom, {UTM_SRID}) AS geom
+                OFFSET 0
+            ) p
+            CROSS JOIN LATERAL (
+                SELECT ST_Area(p.geom) AS area_m2
+            ) a
+            ORDER BY s.{conflict_column}
+            ON CONFLICT ({conflict_column}) {conflict_action}
+            RETURNING (xmax = 0) AS inserted
+        """
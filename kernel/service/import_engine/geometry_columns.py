@@ -0,0 +1,2 @@
+SRID = 4674       # SIRGAS 2000
+UTM_SRID = 31982  # SIRGAS 2000 / UTM 22S
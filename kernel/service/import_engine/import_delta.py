@@ -0,0 +1,126 @@
+from django.db import connection
+
+
+class ImportDelta:
+    """
+    Change detection for incremental imports of a LayerImportSpec.
+
+    - known_fingerprints(): fingerprints already stored, for content-addressed
+      layers (compared inside the workers)
+    - changed_rows(): drops rows of a natural-key layer whose stored
+      fingerprint (or, for rows imported before fingerprints existed, the
+      version field) matches the file
+    - mark_seen() / delete_missing(): identities read from the file are kept
+      in a session temp table; rows not seen are deleted at the end
+
+    Needs the same database connection for the whole run (temp table).
+    """
+
+    SEEN_TABLE = "import_delta_seen"
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.meta = spec.model._meta
+        self.fields = spec.fields
+
+    # -----------------------------------------------------------
+    # Content-addressed layers
+    # -----------------------------------------------------------
+    def known_fingerprints(self):
+        qn = connection.ops.quote_name
+        column = qn(self.meta.get_field("fingerprint").column)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {column} FROM {qn(self.meta.db_table)} WHERE {column} IS NOT NULL"
+            )
+            return frozenset(fingerprint for (fingerprint,) in cursor.fetchall())
+
+    # -----------------------------------------------------------
+    # Natural key layers
+    # -----------------------------------------------------------
+    def changed_rows(self, rows):
+        """Returns (rows to load, number of unchanged rows)."""
+        if self.spec.hash_field or not rows:
+            return rows, 0
+
+        key_index = self.fields.index(self.spec.dedupe_field)
+        fingerprint_index = self.fields.index("fingerprint")
+        version_index = self.fields.index(self.spec.version_field) if self.spec.version_field else None
+
+        stored = self._stored_state([row[key_index] for row in rows])
+
+        changed = []
+        for row in rows:
+            state = stored.get(row[key_index])
+
+            if state is None or not self._unchanged(row, state, fingerprint_index, version_index):
+                changed.append(row)
+
+        return changed, len(rows) - len(changed)
+
+    def _stored_state(self, keys):
+        qn = connection.ops.quote_name
+        key_column = qn(self.meta.get_field(self.spec.dedupe_field).column)
+        columns = [key_column, qn(self.meta.get_field("fingerprint").column)]
+
+        if self.spec.version_field:
+            columns.append(qn(self.meta.get_field(self.spec.version_field).column))
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {', '.join(columns)} FROM {qn(self.meta.db_table)} "
+                f"WHERE {key_column} = ANY(%s)",
+                [keys],
+            )
+            return {row[0]: row[1:] for row in cursor.fetchall()}
+
+    @staticmethod
+    def _unchanged(row, state, fingerprint_index, version_index):
+        stored_fingerprint = state[0]
+
+        if stored_fingerprint is not None:
+            return stored_fingerprint == row[fingerprint_index]
+
+        # Imported before fingerprints existed: fall back to the version date
+        if version_index is not None and state[1] is not None:
+            return state[1] == row[version_index]
+
+        return False
+
+    # -----------------------------------------------------------
+    # Deletions
+    # -----------------------------------------------------------
+    def create_seen_table(self):
+        qn = connection.ops.quote_name
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {qn(self.SEEN_TABLE)}")
+            cursor.execute(f"CREATE TEMP TABLE {qn(self.SEEN_TABLE)} (identity text)")
+
+    def mark_seen(self, identities):
+        qn = connection.ops.quote_name
+
+        with connection.cursor() as cursor:
+            with cursor.copy(f"COPY {qn(self.SEEN_TABLE)} (identity) FROM STDIN") as copy:
+                for identity in identities:
+                    copy.write_row((identity,))
+
+    def delete_missing(self) -> int:
+        """Delete the rows whose identity was not read from the file. Returns the number deleted."""
+        qn = connection.ops.quote_name
+        seen = qn(self.SEEN_TABLE)
+        identity_column = qn(self.meta.get_field(self.spec.identity_field).column)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {seen}")
+            cursor.execute(f"""
+                DELETE FROM {qn(self.meta.db_table)} t
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM {seen} s WHERE s.identity = t.{identity_column}::text
+                )
+            """)
+            deleted = cursor.rowcount
+            cursor.execute(f"DROP TABLE IF EXISTS {seen}")
+
+        return deleted
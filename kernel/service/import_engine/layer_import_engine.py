@@ -0,0 +1,207 @@
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import connection
+
+from kernel.service.import_engine.chunk_formatter import ChunkFormatter, format_chunk_in_worker, init_worker
+from kernel.service.import_engine.copy_loader import CopyLoader
+from kernel.service.import_engine.import_delta import ImportDelta
+from kernel.service.import_engine.shapefile_reader import count_features
+
+
+class LayerImportEngine:
+    """
+    Imports a layer shapefile described by a LayerImportSpec.
+
+    Chunks are read, formatted and hashed in a process pool (each worker
+    reads its own slice of the file); the parent process is the single
+    writer and loads the formatted chunks in file order through the
+    CopyLoader. At most 2 × workers chunks are in flight, so memory stays
+    bounded whatever the file size.
+
+    With incremental=True only new or changed features are written (see
+    ImportDelta); delete_missing=True also removes the rows that are no
+    longer in the file. Both force on_conflict="update": existing rows must
+    get their fingerprint (the identity of hash-keyed layers) written,
+    otherwise legacy rows would never match the file.
+    """
+
+    def __init__(self, spec, user, workers=1, chunk_size=10_000, on_conflict="nothing",
+                 incremental=False, delete_missing=False, progress=None):
+        self.spec = spec
+        self.user = user
+        self.workers = max(1, workers)
+        self.chunk_size = chunk_size
+        self.on_conflict = "update" if incremental or delete_missing else on_conflict
+        self.incremental = incremental
+        self.delete_missing = delete_missing
+        self.progress = progress
+        self.delta = ImportDelta(spec)
+
+    def run(self, path) -> dict:
+        """
+        Returns {"read", "inserted", "updated", "unchanged", "skipped", "deleted",
+        "elapsed", "started_at"}; skipped counts features without geometry or
+        dedupe key; started_at is the database clock at the start of the run
+        (rows written by the import have atualizado_em >= started_at).
+        """
+        started_at = self._database_now()
+
+        known_fingerprints = None
+        if self.incremental and self.spec.hash_field:
+            known_fingerprints = self.delta.known_fingerprints()
+
+        formatter = self.build_formatter(path, known_fingerprints)
+        loader = CopyLoader(
+            self.spec.model,
+            fields=self.spec.fields,
+            conflict_field=self.spec.dedupe_field,
+            on_conflict=self.on_conflict,
+        )
+
+        total = count_features(path)
+        offsets = range(0, total, self.chunk_size)
+
+        totals = {"read": 0, "inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0, "deleted": 0}
+        start = time.perf_counter()
+
+        with self._chunk_source(formatter) as format_chunk:
+            if self.delete_missing:
+                self.delta.create_seen_table()
+
+            for offset, chunk in self._formatted_chunks(format_chunk, offsets):
+                rows = chunk.rows
+
+                if self.delete_missing:
+                    self.delta.mark_seen(chunk.identities)
+
+                if self.incremental:
+                    rows, unchanged = self.delta.changed_rows(rows)
+                    totals["unchanged"] += unchanged + len(chunk.identities) - len(chunk.rows)
+
+                result = loader.load(rows)
+
+                totals["read"] += min(self.chunk_size, total - offset)
+                totals["inserted"] += result["inserted"]
+                totals["updated"] += result["updated"]
+                totals["skipped"] += chunk.skipped
+                totals["elapsed"] = time.perf_counter() - start
+
+                if self.progress:
+                    self.progress(totals, total)
+
+        if self.delete_missing:
+            totals["deleted"] = self.delta.delete_missing()
+
+        totals["elapsed"] = time.perf_counter() - start
+        totals["started_at"] = started_at
+        return totals
+
+    def build_formatter(self, path, known_fingerprints=None):
+        model = self.spec.model
+
+        return ChunkFormatter(
+            path=path,
+            field_mapping=tuple(self.spec.field_mapping.items()),
+            date_formats=dict(self.spec.date_formats),
+            not_null_fields=tuple(
+                name for name in self.spec.field_mapping
+                if not model._meta.get_field(name).null
+            ),
+            hash_field=self.spec.hash_field,
+            identity_field=self.spec.identity_field,
+            dedupe_field=self.spec.dedupe_field,
+            created_by_id=self.user.pk,
+            created_by_name=str(self.user),
+            source=self.spec.source,
+            known_fingerprints=known_fingerprints,
+        )
+
+    # -----------------------------------------------------------
+    # Helpers
+    # -----------------------------------------------------------
+    @staticmethod
+    def _database_now():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT now()")
+            return cursor.fetchone()[0]
+
+    def _chunk_source(self, formatter):
+        """Context manager yielding a submit(offset) -> future-like callable."""
+        if self.workers == 1:
+            return _InlineSource(formatter, self.chunk_size)
+
+        # Workers never touch the database; don't hand them the parent's socket
+        connection.close()
+
+        return _PoolSource(formatter, self.chunk_size, self.workers)
+
+    def _formatted_chunks(self, submit, offsets):
+        """Yield (offset, FormattedChunk) in file order, at most 2 × workers in flight."""
+        offsets = iter(offsets)
+        pending = deque()
+
+        for offset in offsets:
+            pending.append((offset, submit(offset)))
+            if len(pending) >= self.workers * 2:
+                break
+
+        while pending:
+            offset, future = pending.popleft()
+            chunk = future.result()
+
+            next_offset = next(offsets, None)
+            if next_offset is not None:
+                pending.append((next_offset, submit(next_offset)))
+
+            yield offset, chunk
+
+
+class _InlineSource:
+    """Formats chunks in the calling process (workers=1)."""
+
+    def __init__(self, formatter, chunk_size):
+        self.formatter = formatter
+        self.chunk_size = chunk_size
+
+    def __enter__(self):
+        return self.submit
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, offset):
+        return _Done(self.formatter.read_and_format(offset, self.chunk_size))
+
+
+class _PoolSource:
+    """Formats chunks in a spawn process pool; the formatter is sent once per worker."""
+
+    def __init__(self, formatter, chunk_size, workers):
+        self.chunk_size = chunk_size
+        self.pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(formatter,),
+        )
+
+    def __enter__(self):
+        return self.submit
+
+    def __exit__(self, *exc):
+        self.pool.shutdown(cancel_futures=True)
+        return False
+
+    def submit(self, offset):
+        return self.pool.submit(format_chunk_in_worker, offset, self.chunk_size)
+
+
+class _Done:
+    def __init__(self, value):
+        self.value = value
+
+    def result(self):
+        return self.value
@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class LayerImportSpec:
+    """
+    Declarative description of how a layer shapefile maps onto a GeoBaseModel.
+
+    - model: target layer model
+    - file_field: FileManagement attribute holding the ZIP
+    - field_mapping: { model field: shapefile column }
+    - dedupe_field: model field used as ON CONFLICT key
+    - source: value stored in GeoBaseModel.source
+    - label: name used in command messages
+    - date_formats: { model field: strptime format } for date columns
+    - hash_field: when set, this field receives the SHA-256 content hash of the
+      feature and is usually the dedupe key
+    - version_field: date field from the source that changes when a feature
+      is updated upstream; used by incremental imports for rows that have no
+      fingerprint yet
+    """
+
+    model: type
+    file_field: str
+    field_mapping: dict
+    dedupe_field: str
+    source: str
+    label: str
+    date_formats: dict = field(default_factory=dict)
+    hash_field: Optional[str] = None
+    version_field: Optional[str] = None
+
+    @property
+    def fields(self):
+        """Model fields written by the loader, in row order (geometry WKB comes last)."""
+        fields = list(self.field_mapping)
+
+        if self.hash_field:
+            fields.append(self.hash_field)
+
+        return fields + ["fingerprint", "created_by", "source"]
+
+    @property
+    def identity_field(self):
+        """
+        Field identifying a feature between imports: the natural key, or the
+        fingerprint itself for content-addressed (hash_field) layers.
+        """
+        return "fingerprint" if self.hash_field else self.dedupe_field
@@ -0,0 +1,30 @@
+import geopandas as gpd
+import pyogrio
+
+
+def count_features(path) -> int:
+    """Number of features in the first layer of a shapefile/ZIP, without reading it."""
+    return pyogrio.read_info(path, force_feature_count=True)["features"]
+
+
+def read_chunk(path, offset: int, chunk_size: int, columns=None, encoding: str = "utf-8"):
+    """Read chunk_size features starting at offset as a GeoDataFrame."""
+    return gpd.read_file(
+        path,
+        engine="pyogrio",
+        encoding=encoding,
+        columns=columns,
+        skip_features=offset,
+        max_features=chunk_size,
+    )
+
+
+def iter_chunks(path, chunk_size: int, columns=None, encoding: str = "utf-8"):
+    """
+    Yield the features of a shapefile/ZIP as GeoDataFrames of at most
+    chunk_size rows, so only one chunk is held in memory at a time.
+    """
+    total = count_features(path)
+
+    for offset in range(0, total, chunk_size):
+        yield read_chunk(path, offset, chunk_size, columns, encoding)
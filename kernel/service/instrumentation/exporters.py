@@ -0,0 +1,120 @@
+import logging
+import re
+import threading
+from collections import deque
+from dataclasses import asdict
+
+from django.conf import settings
+
+logger = logging.getLogger("kernel.instrumentation")
+
+
+class BaseExporter:
+    def export_span(self, record):
+        raise NotImplementedError
+
+    def export_counter(self, record):
+        raise NotImplementedError
+
+
+class LoggingExporter(BaseExporter):
+    """Writes every span/counter to the "kernel.instrumentation" logger."""
+
+    def export_span(self, record):
+        logger.info("span %s %.4fs %s", record.name, record.duration, record.labels)
+
+    def export_counter(self, record):
+        logger.info("counter %s +%s %s", record.name, record.value, record.labels)
+
+
+class RingBufferExporter(BaseExporter):
+    """Keeps the last N records in memory (exposed by the debug endpoint)."""
+
+    def __init__(self, size=None):
+        size = size or getattr(settings, "INSTRUMENTATION_RING_BUFFER_SIZE", 1000)
+        self._records = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def export_span(self, record):
+        self._append("span", record)
+
+    def export_counter(self, record):
+        self._append("counter", record)
+
+    def snapshot(self):
+        with self._lock:
+            return list(self._records)
+
+    def _append(self, kind, record):
+        with self._lock:
+            self._records.append({"type": kind, **asdict(record)})
+
+
+class PrometheusExporter(BaseExporter):
+    """
+    Aggregates spans (count/sum summaries, in seconds) and counters (totals)
+    and renders them in the Prometheus text exposition format.
+    """
+
+    def __init__(self, namespace="plataforma"):
+        self.namespace = namespace
+        self._spans = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def export_span(self, record):
+        key = (self._metric_name(record.name, "seconds"), self._label_key(record.labels))
+
+        with self._lock:
+            count, total = self._spans.get(key, (0, 0.0))
+            self._spans[key] = (count + 1, total + record.duration)
+
+    def export_counter(self, record):
+        key = (self._metric_name(record.name, "total"), self._label_key(record.labels))
+
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + record.value
+
+    def render(self):
+        with self._lock:
+            spans = dict(self._spans)
+            counters = dict(self._counters)
+
+        lines = []
+
+        for metric in sorted({name for name, _ in spans}):
+            lines.append(f"# TYPE {metric} summary")
+            for (name, labels), (count, total) in sorted(spans.items()):
+                if name == metric:
+                    lines.append(f"{metric}_count{self._format_labels(labels)} {count}")
+                    lines.append(f"{metric}_sum{self._format_labels(labels)} {total:.6f}")
+
+        for metric in sorted({name for name, _ in counters}):
+            lines.append(f"# TYPE {metric} counter")
+            for (name, labels), value in sorted(counters.items()):
+                if name == metric:
+                    lines.append(f"{metric}{self._format_labels(labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    # -----------------------------------------------------------
+    # Helpers
+    # -----------------------------------------------------------
+    def _metric_name(self, name, suffix):
+        return re.sub(r"[^a-zA-Z0-9_]", "_", f"{self.namespace}_{name}_{suffix}")
+
+    @staticmethod
+    def _label_key(labels):
+        return tuple(sorted((str(key), str(value)) for key, value in labels.items()))
+
+    @staticmethod
+    def _format_labels(labels):
+        if not labels:
+            return ""
+
+        escaped = ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in labels)
+        return "{" + escaped + "}"
+
+
+def _escape_label_value(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,106 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+@dataclass
+class SpanRecord:
+    name: str
+    duration: float
+    started_at: float
+    labels: dict = field(default_factory=dict)
+
+
+@dataclass
+class CounterRecord:
+    name: str
+    value: float
+    recorded_at: float
+    labels: dict = field(default_factory=dict)
+
+
+class NoOpInstrumentation:
+    """Default instrumentation: spans and counters cost (almost) nothing."""
+
+    exporters = ()
+
+    @contextmanager
+    def span(self, name, **labels):
+        yield
+
+    def count(self, name, value=1, **labels):
+        pass
+
+    def get_exporter(self, exporter_class):
+        return None
+
+
+class Instrumentation(NoOpInstrumentation):
+    """
+    Records spans (timed blocks) and counters and forwards them to exporters.
+
+    Usage:
+        with instrumentation.span("overlap.layer_sql", layer="ZoningArea"):
+            ...
+        instrumentation.count("overlap.rows", len(rows), layer="ZoningArea")
+    """
+
+    def __init__(self, exporters):
+        self.exporters = tuple(exporters)
+
+    @contextmanager
+    def span(self, name, **labels):
+        started_at = time.time()
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            record = SpanRecord(name, time.perf_counter() - start, started_at, labels)
+
+            for exporter in self.exporters:
+                exporter.export_span(record)
+
+    def count(self, name, value=1, **labels):
+        record = CounterRecord(name, value, time.time(), labels)
+
+        for exporter in self.exporters:
+            exporter.export_counter(record)
+
+    def get_exporter(self, exporter_class):
+        for exporter in self.exporters:
+            if isinstance(exporter, exporter_class):
+                return exporter
+        return None
+
+
+EXPORTER_ALIASES = {
+    "logging": "kernel.service.instrumentation.exporters.LoggingExporter",
+    "ring_buffer": "kernel.service.instrumentation.exporters.RingBufferExporter",
+    "prometheus": "kernel.service.instrumentation.exporters.PrometheusExporter",
+}
+
+_instrumentation = None
+_instrumentation_lock = threading.Lock()
+
+
+def get_instrumentation():
+    """
+    Return the process-wide instrumentation configured in
+    settings.INSTRUMENTATION_EXPORTERS (aliases or dotted paths).
+    Without exporters a NoOpInstrumentation is returned.
+    """
+    global _instrumentation
+
+    with _instrumentation_lock:
+        if _instrumentation is None:
+            names = getattr(settings, "INSTRUMENTATION_EXPORTERS", [])
+            exporters = [import_string(EXPORTER_ALIASES.get(name, name))() for name in names if name]
+
+            _instrumentation = Instrumentation(exporters) if exporters else NoOpInstrumentation()
+
+    return _instrumentation
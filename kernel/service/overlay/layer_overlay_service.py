@@ -0,0 +1,238 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+
+from kernel.service.import_engine.geometry_columns import SRID, UTM_SRID
+from kernel.service.spatial_sql import CONTAINMENT_FILTER_SQL, containment_lateral_sql
+
+
+class LayerOverlayService:
+    """
+    Maintains `environmental_layers_overlay`: one planar partition of all
+    the layers in LAYER_OVERLAY_LAYERS. Each face carries, per layer label,
+    the ids of the features covering it (layer_ids jsonb), its UTM copy
+    and its area.
+
+    The partition is built per grid cell (LAYER_OVERLAY_CELL_SIZE degrees):
+    the features are clipped to the cell, their boundaries are noded with
+    ST_Union and polygonized into faces, and each face is labelled by the
+    features containing one of its interior points. Cells are independent,
+    so they are built in parallel and faces stay small.
+
+    A single intersection of the target with the faces then answers every
+    overlay layer: the area of a feature is the sum over the faces listing
+    it. The table is rebuilt (into a new table, swapped at the end) when one
+    of its layers is re-imported.
+    """
+
+    TABLE = "environmental_layers_overlay"
+
+    _built = False
+    _lock = threading.Lock()
+
+    def __init__(self, cell_size=None):
+        self.cell_size = cell_size or getattr(settings, "LAYER_OVERLAY_CELL_SIZE", 0.5)
+
+    # -----------------------------------------------------------
+    # Lookup
+    # -----------------------------------------------------------
+    @staticmethod
+    def layers():
+        return [apps.get_model(label) for label in getattr(settings, "LAYER_OVERLAY_LAYERS", ())]
+
+    def is_enabled(self):
+        """Table built. Only a positive lookup is cached (the table is swapped, never dropped)."""
+        with self._lock:
+            if LayerOverlayService._built:
+                return True
+
+        if not self.table_exists():
+            return False
+
+        with self._lock:
+            LayerOverlayService._built = True
+
+        return True
+
+    def table_exists(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [self.TABLE])
+            return cursor.fetchone()[0]
+
+    # -----------------------------------------------------------
+    # Maintenance
+    # -----------------------------------------------------------
+    def rebuild(self, workers=1, progress=None) -> int:
+        """Build the overlay into a new table and swap it in. Returns the number of faces."""
+        qn = connection.ops.quote_name
+        table = qn(self.TABLE)
+        building = qn(f"{self.TABLE}_new")
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {building}")
+            cursor.execute(f"""
+                CREATE TABLE {building} (
+                    id bigserial PRIMARY KEY,
+                    geom geometry(Polygon, {SRID}) NOT NULL,
+                    geom_utm geometry(Polygon, {UTM_SRID}) NOT NULL,
+                    area_m2 double precision NOT NULL,
+                    layer_ids jsonb NOT NULL
+                )
+            """)
+
+        cells = self._cells()
+        sql = self._cell_sql(building)
+        faces = 0
+
+        if workers <= 1:
+            for position, cell in enumerate(cells, start=1):
+                faces += self._build_cell(sql, cell)
+                if progress:
+                    progress(position, len(cells), faces)
+        else:
+            # Connections are per thread: release the caller's before the workers start
+            connection.close()
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(self._build_cell_in_thread, sql, cell) for cell in cells]
+
+                for position, future in enumerate(as_completed(futures), start=1):
+                    faces += future.result()
+                    if progress:
+                        progress(position, len(cells), faces)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE INDEX ON {building} USING gist (geom)")
+            cursor.execute(f"ANALYZE {building}")
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            cursor.execute(f"ALTER TABLE {building} RENAME TO {table}")
+
+        return faces
+
+    def sync(self, layer) -> int:
+        """Rebuild after an import of `layer` when it is part of a built overlay. Returns the number of faces."""
+        if layer._meta.label not in getattr(settings, "LAYER_OVERLAY_LAYERS", ()):
+            return 0
+
+        if not self.table_exists():
+            return 0
+
+        return self.rebuild()
+
+    def _cells(self):
+        """Grid cells (xmin, ymin, xmax, ymax) covering the extent of the overlay layers."""
+        qn = connection.ops.quote_name
+        extents = " UNION ALL ".join(
+            f"SELECT ST_Extent({qn(layer._meta.get_field('geometry_new').column)})::geometry AS geom "
+            f"FROM {qn(layer._meta.db_table)}"
+            for layer in self.layers()
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT ST_XMin(e), ST_YMin(e), ST_XMax(e), ST_YMax(e)
+                FROM (SELECT ST_Extent(geom) AS e FROM ({extents}) x) extent
+            """)
+            xmin, ymin, xmax, ymax = cursor.fetchone()
+
+        if xmin is None:
+            return []
+
+        size = self.cell_size
+        columns = max(1, int((xmax - xmin) // size) + 1)
+        rows = max(1, int((ymax - ymin) // size) + 1)
+
+        return [
+            (xmin + column * size, ymin + row * size, xmin + (column + 1) * size, ymin + (row + 1) * size)
+            for column in range(columns)
+            for row in range(rows)
+        ]
+
+    def _build_cell_in_thread(self, sql, cell):
+        try:
+            return self._build_cell(sql, cell)
+        finally:
+            connection.close()
+
+    def _build_cell(self, sql, cell):
+        labels = [layer._meta.label for layer in self.layers()]
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, [*cell, *labels])
+            return cursor.rowcount
+
+    def _cell_sql(self, table):
+        """INSERT of the faces of one cell. Parameters: cell bounds, then one label per layer."""
+        qn = connection.ops.quote_name
+
+        features = " UNION ALL ".join(
+            f"""
+                SELECT
+                    %s::text AS layer,
+                    l.id,
+                    ST_CollectionExtract(ST_Intersection(ST_MakeValid(l.{qn(layer._meta.get_field('geometry_new').column)}), cell.geom), 3) AS geom
+                FROM {qn(layer._meta.db_table)} l, cell
+                WHERE ST_Intersects(l.{qn(layer._meta.get_field('geometry_new').column)}, cell.geom)
+            """
+            for layer in self.layers()
+        )
+
+        # features is referenced twice, so it is materialized once
+        return f"""
+            WITH cell AS (
+                SELECT ST_MakeEnvelope(%s, %s, %s, %s, {SRID}) AS geom
+            ),
+            features AS (
+                SELECT * FROM ({features}) f
+                WHERE NOT ST_IsEmpty(f.geom)
+            ),
+            faces AS (
+                SELECT (ST_Dump(ST_Polygonize(e.geom))).geom AS geom
+                FROM (SELECT ST_Union(ST_Boundary(geom)) AS geom FROM features) e
+            )
+            INSERT INTO {table} (geom, geom_utm, area_m2, layer_ids)
+            SELECT f.geom, p.geom_utm, ST_Area(p.geom_utm), ids.layer_ids
+            FROM faces f
+            CROSS JOIN LATERAL (
+                SELECT ST_Transform(f.geom, {UTM_SRID}) AS geom_utm
+                OFFSET 0
+            ) p
+            CROSS JOIN LATERAL (
+                SELECT jsonb_object_agg(x.layer, x.ids) AS layer_ids
+                FROM (
+                    SELECT ft.layer, jsonb_agg(ft.id ORDER BY ft.id) AS ids
+                    FROM features ft
+                    WHERE ST_Intersects(ft.geom, ST_PointOnSurface(f.geom))
+                    GROUP BY ft.layer
+                ) x
+            ) ids
+            WHERE ids.layer_ids IS NOT NULL
+        """
+
+    # -----------------------------------------------------------
+    # SQL used by the overlap engines
+    # -----------------------------------------------------------
+    def intersection_sql(self):
+        """
+        Subquery returning (layer label, feature_id, intersection_area_m2) for
+        every overlay feature overlapping the target, summed over its faces.
+        Expects a `target` CTE (kernel.service.spatial_sql.TARGET_CTE_SQL)
+        and one parameter: the array of layer labels to return.
+        """
+        return f"""
+            SELECT e.key AS layer, v.value::bigint AS feature_id, SUM(a.intersection_area_m2) AS intersection_area_m2
+            FROM {connection.ops.quote_name(self.TABLE)} o
+            CROSS JOIN target t
+            {containment_lateral_sql("o.geom", "o.area_m2", projected_geom="o.geom_utm")}
+            CROSS JOIN LATERAL jsonb_each(o.layer_ids) e
+            CROSS JOIN LATERAL jsonb_array_elements_text(e.value) v
+            WHERE ST_Intersects(o.geom, t.geom)
+              AND {CONTAINMENT_FILTER_SQL}
+              AND e.key = ANY(%s)
+            GROUP BY e.key, v.value
+        """
@@ -0,0 +1,106 @@
+"""
+SQL fragments shared by the overlap engines.
+
+containment_lateral_sql classifies a candidate geometry against the target
+before any overlay:
+- "covers": the candidate covers the target, so the intersection is the
+  target itself and its area is the target area
+- "covered": the candidate lies inside the target, so the intersection is the
+  candidate and its area is the candidate area (usually precomputed)
+- otherwise (partial overlap) ST_Intersection is computed
+
+ST_Covers/ST_CoveredBy reuse PostGIS' prepared-geometry cache for the
+constant target, so they are much cheaper than the overlay they avoid.
+
+Layers storing a projected copy of their geometry (geometry_utm, see
+GeoBaseModel.stores_projected_geometry) are intersected directly in UTM
+against the target projected once, instead of transforming every
+intersection.
+"""
+from django.db import connection
+
+from kernel.service.import_engine.geometry_columns import UTM_SRID
+
+# `target` CTE expected by the fragments below; see target_params()
+TARGET_CTE_SQL = """
+    target AS (
+        SELECT
+            ST_GeomFromEWKB(%s) AS geom,
+            ST_GeomFromEWKB(%s) AS geom_utm,
+            %s::float8 AS area_m2
+    )
+"""
+
+
+def target_params(target):
+    """Parameters of TARGET_CTE_SQL for a GeometryTarget."""
+    return [bytes(target.geometry.ewkb), bytes(target.geometry_utm.ewkb), target.area_m2]
+
+
+def containment_lateral_sql(geom, area_m2, target="t", projected_geom=None):
+    """
+    LATERAL joins exposing c.containment, i.geom (intersection, partial
+    overlaps only) and a.intersection_area_m2. `target` must have `geom`
+    and `area_m2` columns, and `geom_utm` when `projected_geom` (the
+    candidate in UTM) is given.
+
+    OFFSET 0 keeps the planner from pulling the subqueries up, which would
+    repeat ST_Covers / ST_Intersection at every reference.
+    """
+    if projected_geom is None:
+        intersection = f"ST_Intersection({geom}, {target}.geom)"
+        intersection_area = utm_area_sql("i.geom")
+    else:
+        intersection = f"ST_Intersection({projected_geom}, {target}.geom_utm)"
+        intersection_area = "ST_Area(i.geom)"
+
+    return f"""
+        CROSS JOIN LATERAL (
+            SELECT CASE
+                WHEN ST_Covers({geom}, {target}.geom) THEN 'covers'
+                WHEN ST_CoveredBy({geom}, {target}.geom) THEN 'covered'
+            END AS containment
+            OFFSET 0
+        ) c
+        CROSS JOIN LATERAL (
+            SELECT CASE WHEN c.containment IS NULL THEN {intersection} END AS geom
+            OFFSET 0
+        ) i
+        CROSS JOIN LATERAL (
+            SELECT CASE c.containment
+                WHEN 'covers' THEN {target}.area_m2
+                WHEN 'covered' THEN {area_m2}
+                ELSE {intersection_area}
+            END AS intersection_area_m2
+        ) a
+    """
+
+
+# Same rows as "NOT ST_IsEmpty(ST_Intersection(...))" without computing the
+# intersection of contained candidates
+CONTAINMENT_FILTER_SQL = "(c.containment IS NOT NULL OR NOT ST_IsEmpty(i.geom))"
+
+
+def utm_area_sql(geom):
+    return f"ST_Area(ST_Transform({geom}, {UTM_SRID}))"
+
+
+def layer_containment_sql(layer, alias="l", target="t"):
+    """
+    containment_lateral_sql for a GeoBaseModel table aliased as `alias`:
+    stored area_m2 for contained features and the projected column when the
+    layer keeps one (rows not backfilled yet are projected on the fly).
+    """
+    qn = connection.ops.quote_name
+    meta = layer._meta
+    geom = f"{alias}.{qn(meta.get_field('geometry_new').column)}"
+    area_m2 = f"COALESCE({alias}.{qn(meta.get_field('area_m2').column)}, {utm_area_sql(geom)})"
+    projected_geom = None
+
+    if layer.stores_projected_geometry():
+        projected_geom = (
+            f"COALESCE({alias}.{qn(meta.get_field('geometry_utm').column)}, "
+            f"ST_Transform({geom}, {UTM_SRID}))"
+        )
+
+    return containment_lateral_sql(geom, area_m2, target, projected_geom)
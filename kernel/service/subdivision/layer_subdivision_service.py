@@ -0,0 +1,168 @@
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from kernel.service.import_engine.geometry_columns import SRID, UTM_SRID
+from kernel.service.spatial_sql import CONTAINMENT_FILTER_SQL, containment_lateral_sql
+
+
+class LayerSubdivisionService:
+    """
+    Maintains a `<layer table>_subdivided` copy of a GeoBaseModel layer in
+    which every polygon is split with ST_Subdivide into pieces of at most
+    SUBDIVIDE_MAX_VERTICES vertices.
+
+    Small pieces have tight bounding boxes, so the GiST index discards far
+    more candidates and ST_Intersection works on a few hundred vertices
+    instead of the whole feature. The pieces of a feature partition it, so
+    summing the intersection areas per source_id gives the same result as
+    intersecting the original polygon. Each piece is also stored in UTM
+    (geom_utm), so intersections and areas are computed in projected space
+    without reprojecting at query time.
+
+    Only layers listed in OVERLAP_SUBDIVIDED_LAYERS are used by the overlap
+    engines, and only once their table has been built
+    (manage.py build_subdivided_layers).
+    """
+
+    _built_tables = set()
+    _lock = threading.Lock()
+
+    def __init__(self, max_vertices=None):
+        self.max_vertices = max_vertices or getattr(settings, "SUBDIVIDE_MAX_VERTICES", 256)
+
+    # -----------------------------------------------------------
+    # Lookup
+    # -----------------------------------------------------------
+    @staticmethod
+    def table_name(layer):
+        return f"{layer._meta.db_table}_subdivided"
+
+    def is_configured(self, layer):
+        return layer._meta.label in getattr(settings, "OVERLAP_SUBDIVIDED_LAYERS", ())
+
+    def is_enabled(self, layer):
+        """Configured and built. Only positive lookups are cached (tables are never dropped at runtime)."""
+        if not self.is_configured(layer):
+            return False
+
+        table = self.table_name(layer)
+
+        with self._lock:
+            if table in self._built_tables:
+                return True
+
+        if not self.table_exists(layer):
+            return False
+
+        with self._lock:
+            self._built_tables.add(table)
+
+        return True
+
+    def table_exists(self, layer):
+        """Tables built before pieces kept geom_utm count as missing (rebuild them)."""
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT EXISTS (
+                    SELECT 1 FROM pg_attribute
+                    WHERE attrelid = to_regclass(%s)
+                      AND attname = 'geom_utm'
+                      AND NOT attisdropped
+                )
+            """, [self.table_name(layer)])
+            return cursor.fetchone()[0]
+
+    # -----------------------------------------------------------
+    # Maintenance
+    # -----------------------------------------------------------
+    def rebuild(self, layer) -> int:
+        """(Re)create the table and subdivide every feature. Returns the number of pieces."""
+        qn = connection.ops.quote_name
+        table = qn(self.table_name(layer))
+        meta = layer._meta
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            cursor.execute(f"""
+                CREATE TABLE {table} (
+                    id bigserial PRIMARY KEY,
+                    source_id bigint NOT NULL
+                        REFERENCES {qn(meta.db_table)} (id) ON DELETE CASCADE,
+                    geom geometry(Geometry, {SRID}) NOT NULL,
+                    geom_utm geometry(Geometry, {UTM_SRID}) NOT NULL
+                )
+            """)
+            pieces = self._insert_pieces(cursor, layer)
+            cursor.execute(f"CREATE INDEX ON {table} USING gist (geom)")
+            cursor.execute(f"CREATE INDEX ON {table} (source_id)")
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {table}")
+
+        return pieces
+
+    def sync(self, layer, since) -> int:
+        """
+        Re-subdivide the features written since `since` (atualizado_em).
+        Deleted features are removed by the foreign key cascade. No-op when
+        the table was never built. Returns the number of pieces inserted.
+        """
+        if not self.table_exists(layer):
+            return 0
+
+        qn = connection.ops.quote_name
+        table = qn(self.table_name(layer))
+        meta = layer._meta
+        updated_at = qn(meta.get_field("updated_at").column)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"""
+                DELETE FROM {table}
+                WHERE source_id IN (
+                    SELECT id FROM {qn(meta.db_table)} WHERE {updated_at} >= %s
+                )
+            """, [since])
+            return self._insert_pieces(cursor, layer, f"{updated_at} >= %s", [since])
+
+    def _insert_pieces(self, cursor, layer, where="TRUE", params=()):
+        qn = connection.ops.quote_name
+        meta = layer._meta
+        geom_column = qn(meta.get_field("geometry_new").column)
+
+        # Polygonal part of the repaired geometry; invalid input would make
+        # ST_Subdivide fail for the whole statement
+        cursor.execute(f"""
+            INSERT INTO {qn(self.table_name(layer))} (source_id, geom, geom_utm)
+            SELECT p.source_id, p.geom, ST_Transform(p.geom, {UTM_SRID})
+            FROM (
+                SELECT l.id AS source_id, ST_Subdivide(ST_CollectionExtract(ST_MakeValid(l.{geom_column}), 3), %s) AS geom
+                FROM {qn(meta.db_table)} l
+                WHERE l.{geom_column} IS NOT NULL
+                  AND {where}
+            ) p
+        """, [self.max_vertices, *params])
+        return cursor.rowcount
+
+    # -----------------------------------------------------------
+    # SQL used by the overlap engines
+    # -----------------------------------------------------------
+    def intersection_sql(self, layer):
+        """
+        Subquery returning (source_id, intersection_area_m2) for every feature
+        of the layer that overlaps the target, aggregated from its pieces.
+        Pieces inside the target count with their own area; partial overlaps
+        are intersected in UTM. Expects the `target` CTE (TARGET_CTE_SQL).
+        """
+        table = connection.ops.quote_name(self.table_name(layer))
+
+        return f"""
+            SELECT s.source_id, SUM(a.intersection_area_m2) AS intersection_area_m2
+            FROM {table} s
+            CROSS JOIN target t
+            {containment_lateral_sql("s.geom", "ST_Area(s.geom_utm)", projected_geom="s.geom_utm")}
+            WHERE ST_Intersects(s.geom, t.geom)
+              AND {CONTAINMENT_FILTER_SQL}
+            GROUP BY s.source_id
+        """
@@ -13,7 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
-from decouple import config
+from decouple import config, Csv
 import os
 
 
@@ -141,6 +141,135 @@ LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
 
 
+# Overlap analysis
+# "per_layer" runs one query per layer; "single_query" computes every layer in one statement;
+# "overlay" answers the LAYER_OVERLAY_LAYERS with one query against their planar overlay.
+OVERLAP_ENGINE = config('OVERLAP_ENGINE', default='per_layer')
+
+# Threads used by the "per_layer" engine to process layers concurrently (1 = sequential).
+# Each worker holds its own database connection while it runs.
+OVERLAP_MAX_WORKERS = config('OVERLAP_MAX_WORKERS', default=1, cast=int)
+
+# Layers analysed through their ST_Subdivide copy (<table>_subdivided, built by
+# manage.py build_subdivided_layers and kept in sync by the import commands)
+OVERLAP_SUBDIVIDED_LAYERS = config(
+    'OVERLAP_SUBDIVIDED_LAYERS',
+    default='environmental_layers.EnvironmentalProtectionArea,environmental_layers.PhytoecologyArea,environmental_layers.ZoningArea',
+    cast=Csv(),
+)
+SUBDIVIDE_MAX_VERTICES = config('SUBDIVIDE_MAX_VERTICES', default=256, cast=int)
+
+# Layers keeping a UTM 22S copy of their geometry (geometria_utm), filled by the
+# importers, save() and manage.py convert; intersections are then computed in
+# projected space without reprojecting every row. Used by the engines reading the
+# layer table (precomputed CAR overlaps, layers whose subdivided table is not
+# built); subdivided pieces keep their own UTM copy.
+PROJECTED_GEOMETRY_LAYERS = config(
+    'PROJECTED_GEOMETRY_LAYERS',
+    default='environmental_layers.EnvironmentalProtectionArea,environmental_layers.PhytoecologyArea,environmental_layers.ZoningArea',
+    cast=Csv(),
+)
+
+# Planar overlay of the environmental layers (manage.py build_layer_overlay), rebuilt by
+# the import commands of these layers. Built per grid cell of LAYER_OVERLAY_CELL_SIZE degrees.
+LAYER_OVERLAY_LAYERS = config(
+    'LAYER_OVERLAY_LAYERS',
+    default='environmental_layers.ZoningArea,environmental_layers.PhytoecologyArea,'
+            'environmental_layers.EnvironmentalProtectionArea,environmental_layers.IndigenousArea',
+    cast=Csv(),
+)
+LAYER_OVERLAY_CELL_SIZE = config('LAYER_OVERLAY_CELL_SIZE', default=0.5, cast=float)
+
+# Targets above these limits are split into quadtree tiles analysed in parallel
+# (0 disables a limit). Each tile worker holds its own database connection.
+OVERLAP_TILE_MAX_VERTICES = config('OVERLAP_TILE_MAX_VERTICES', default=20000, cast=int)
+OVERLAP_TILE_MAX_AREA_HA = config('OVERLAP_TILE_MAX_AREA_HA', default=0, cast=float)
+OVERLAP_TILE_MAX_DEPTH = config('OVERLAP_TILE_MAX_DEPTH', default=4, cast=int)
+OVERLAP_TILE_WORKERS = config('OVERLAP_TILE_WORKERS', default=4, cast=int)
+
+# Seconds a layer row count (analysis summary) is kept in cache
+LAYER_STATISTICS_TTL = config('LAYER_STATISTICS_TTL', default=300, cast=int)
+
+# Analysis result cache, keyed by target geometry + layer data versions.
+# BACKEND: "memory" (per process, LRU), "filesystem", "django" (CACHES alias) or "none".
+# MAX_ENTRIES bounds the memory and filesystem backends.
+# The filesystem backend stores pickles: keep LOCATION out of MEDIA_ROOT (served and
+# writable by uploads), unpickling a planted file would run arbitrary code.
+ANALYSIS_RESULT_CACHE = {
+    'BACKEND': config('ANALYSIS_RESULT_CACHE_BACKEND', default='memory'),
+    'TTL': config('ANALYSIS_RESULT_CACHE_TTL', default=3600, cast=int),
+    'MAX_ENTRIES': config('ANALYSIS_RESULT_CACHE_MAX_ENTRIES', default=256, cast=int),
+    'LOCATION': config('ANALYSIS_RESULT_CACHE_LOCATION', default=os.path.join(BASE_DIR, 'var', 'cache', 'analysis')),
+    'ALIAS': config('ANALYSIS_RESULT_CACHE_ALIAS', default='default'),
+}
+
+
+# Instrumentation (spans/counters of the analysis pipeline)
+# Comma separated exporters: "logging", "ring_buffer", "prometheus" or dotted paths.
+# Empty = no-op instrumentation.
+INSTRUMENTATION_EXPORTERS = config('INSTRUMENTATION_EXPORTERS', default='', cast=Csv())
+INSTRUMENTATION_RING_BUFFER_SIZE = config('INSTRUMENTATION_RING_BUFFER_SIZE', default=1000, cast=int)
+
+
+# Municipality/UF lookup of analysed geometries
+# "offline": local IBGE boundary layer (import_municipality_boundary)
+# "nominatim": OpenStreetMap reverse geocoding over HTTP
+# "auto": offline first, Nominatim only when the point is not covered
+CITY_STATE_LOCATOR = config('CITY_STATE_LOCATOR', default='auto')
+
+
+# Maximum number of features accepted by the batch analysis endpoint (api/batch/)
+ANALYSIS_BATCH_MAX_FEATURES = config('ANALYSIS_BATCH_MAX_FEATURES', default=1000, cast=int)
+
+# Background analysis jobs (api/jobs/ + manage.py run_analysis_worker)
+ANALYSIS_WORKER_CONCURRENCY = config('ANALYSIS_WORKER_CONCURRENCY', default=2, cast=int)
+ANALYSIS_WORKER_POLL_INTERVAL = config('ANALYSIS_WORKER_POLL_INTERVAL', default=2.0, cast=float)
+# Seconds after which a running job is considered abandoned and re-queued
+ANALYSIS_JOB_TIMEOUT = config('ANALYSIS_JOB_TIMEOUT', default=1800, cast=int)
+ANALYSIS_JOB_MAX_ATTEMPTS = config('ANALYSIS_JOB_MAX_ATTEMPTS', default=3, cast=int)
+# Seconds between two checks for abandoned jobs while the worker runs
+ANALYSIS_WORKER_REQUEUE_INTERVAL = config('ANALYSIS_WORKER_REQUEUE_INTERVAL', default=60.0, cast=float)
+
+# Tokens accepted by the JSON API (header "Authorization: Bearer <token>").
+# Logged-in users can call it too, with the CSRF token.
+ANALYSIS_API_TOKENS = config('ANALYSIS_API_TOKENS', default='', cast=Csv())
+
+
+# Caches. "geocoding" is file based so reverse geocoding results survive restarts.
+# "shared" (database, manage.py createcachetable) holds state every process must see,
+# such as the Nominatim rate-limit slots. File caches store pickles: keep them out of MEDIA_ROOT.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'geocoding': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('GEOCODING_CACHE_LOCATION', default=os.path.join(BASE_DIR, 'var', 'cache', 'geocoding')),
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'tb_cache_compartilhado',
+    },
+}
+
+# Nominatim reverse geocoding (CITY_STATE_LOCATOR "nominatim"/"auto")
+# RATE: requests per second (public Nominatim policy: 1). PRECISION: decimals of the cached point.
+# DEADLINE: seconds a lookup may take inside a request (rate limit, timeouts and retries included).
+NOMINATIM = {
+    'URL': config('NOMINATIM_URL', default='https://nominatim.openstreetmap.org/reverse'),
+    'USER_AGENT': config('NOMINATIM_USER_AGENT', default='OverlayPlatform/1.0 (contact@example.com)'),
+    'TIMEOUT': config('NOMINATIM_TIMEOUT', default=10, cast=int),
+    'DEADLINE': config('NOMINATIM_DEADLINE', default=8, cast=float),
+    'RATE': config('NOMINATIM_RATE', default=1.0, cast=float),
+    'RETRIES': config('NOMINATIM_RETRIES', default=3, cast=int),
+    'CACHE_ALIAS': 'geocoding',
+    'RATE_LIMIT_CACHE_ALIAS': config('NOMINATIM_RATE_LIMIT_CACHE_ALIAS', default='shared'),
+    'CACHE_TTL': config('NOMINATIM_CACHE_TTL', default=60 * 60 * 24 * 30, cast=int),
+    'PRECISION': config('NOMINATIM_PRECISION', default=4, cast=int),
+}
+
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -4,6 +4,8 @@ import geopandas as gpd
 from shapely.geometry import Polygon, MultiPolygon
 from typing import Any, Callable, Dict, List, Optional
 from kernel.service.city_state_locator_service import CityStateLocatorService
+from environmental_layers.services.locator.municipality_locator_service import MunicipalityLocatorService
+from django.conf import settings
 from django.contrib.gis.geos import GEOSGeometry
 
 def base_result(
@@ -50,10 +52,23 @@ def calculate_area_ha(wkt_str: str) -> float:
 
     return area_m2_total / 10_000  # converte m² para hectares
 
-def locate_city_state(wkt_str: str, method: str = 'representative') -> tuple[Optional[str], Optional[str]]:
-    """Função auxiliar para localizar cidade e estado a partir de WKT usando CityStateLocatorService."""
-    locator = CityStateLocatorService()
-    return locator.locate(wkt_str, method)
+def locate_city_state(geometry, method: str = 'representative') -> tuple[Optional[str], Optional[str]]:
+    """
+    Localiza cidade e estado (UF) de uma geometria (WKT ou GEOSGeometry).
+
+    settings.CITY_STATE_LOCATOR define a estratégia: "offline" (malha municipal
+    local), "nominatim" (consulta HTTP) ou "auto" (offline e, se o ponto não
+    estiver coberto pela malha, Nominatim).
+    """
+    mode = getattr(settings, 'CITY_STATE_LOCATOR', 'auto')
+
+    if mode in ('offline', 'auto'):
+        city, uf = MunicipalityLocatorService().locate(geometry, method)
+        if city or mode == 'offline':
+            return city, uf
+
+    wkt_str = geometry.wkt if isinstance(geometry, GEOSGeometry) else geometry
+    return CityStateLocatorService().locate(wkt_str, method)
 
 from django.contrib.gis.geos import GEOSGeometry
 import geopandas as gpd
@@ -76,6 +91,25 @@ def extract_geometry(gdf: gpd.GeoDataFrame, srid: int = 4674) -> GEOSGeometry:
     return None
 
 
+def extract_geometries(gdf: gpd.GeoDataFrame, srid: int = 4674) -> list[tuple[Any, GEOSGeometry]]:
+    """
+    Retorna todas as geometrias POLYGON/MULTIPOLYGON do GeoDataFrame como
+    (índice da feição, GEOSGeometry com SRID definido).
+    """
+    geometries = []
+
+    for index, geom in gdf.geometry.items():
+        if geom is None:
+            continue
+
+        if geom.geom_type in ("Polygon", "MultiPolygon"):
+            g = GEOSGeometry(geom.wkt)
+            g.srid = srid
+            geometries.append((index, g))
+
+    return geometries
+
+
 def should_include_by_percentage(
     overlap_area: float,
     total_area: float,